@@ -3,12 +3,26 @@ try:
     from gf2c import findRandomGeneratorPolynomial
 except ImportError:
     from gf2.gf2 import findRandomIrreduciblePolynomial
-    from gf2.gf2 import findRandomGeneratorPolynomial    
+    
+    # Candidates are tested against the cached factorization of 2**size-1
+    from groupOrder import findGenerator as findRandomGeneratorPolynomial
+
+import threading
+from collections import deque, OrderedDict
+
+from gf2 import GF2
 
 try:
     import ElGamalGF2
+    native = True
 except ImportError:
-    pass
+    native = False
+
+# Rows of keys can be worked on together with NumPy (see encryptRow and decryptRow)
+try:
+    from gf2array import GF2Array
+except ImportError:
+    GF2Array = None
 
 def generateKey(generator, groupSize, random):
     secretKey = random.randrange(groupSize)
@@ -39,6 +53,238 @@ def decrypt(ciphertext, secretKey, *, modulus = None):
         message = c2 / sharedSecret
         return message
 
+def encryptRow(messages, generators, publicKeys, mods, lgGroupSize, random):
+    '''
+    Encrypt messages[i] under (generators[i], publicKeys[i]) in GF(2^lgGroupSize) mod mods[i] all at once
+    
+    @return - A list of (ephemeralPublicKey, c2) int pairs
+    '''
+    ephemeralSecretKeys = [random.randrange(2**lgGroupSize) for i in messages]
+    ephemeralPublicKeys = GF2Array(generators, lgGroupSize, mods) ** ephemeralSecretKeys
+    sharedSecrets = GF2Array(publicKeys, lgGroupSize, mods) ** ephemeralSecretKeys
+    c2 = sharedSecrets * messages
+    return list(zip(ephemeralPublicKeys, c2))
+
+def decryptRow(ephemeralPublicKeys, c2, secretKeys, mods, lgGroupSize):
+    '''
+    Decrypt the ciphertexts (ephemeralPublicKeys[i], c2[i]) with secretKeys[i] in GF(2^lgGroupSize) mod mods[i] all at once
+    
+    The halves are taken separately so an array('Q') of each is used without building a pair per ciphertext
+    
+    @return - A list of the messages as ints
+    '''
+    sharedSecrets = GF2Array(ephemeralPublicKeys, lgGroupSize, mods) ** secretKeys
+    return (GF2Array(c2, lgGroupSize, mods) / sharedSecrets).tolist()
+
+def verifyRow(generators, secretKeys, publicKeys, mods, lgGroupSize):
+    '''
+    Check that generators[i]**secretKeys[i] == publicKeys[i] for every i at once
+    
+    @return - A list of bools
+    '''
+    return (GF2Array(generators, lgGroupSize, mods) ** secretKeys).equal(publicKeys).tolist()
+
+class PoolExhaustedError(Exception):
+    pass
+
+class EphemeralPool:
+    '''
+    Per recipient pools of precomputed (generator**r, publicKey**r) pairs
+    
+    Neither half of a pair depends on the message, so they can be computed ahead of time (in batches, optionally
+    on a background worker) leaving a single field multiplication for each online encryption. Each pair is
+    removed from its pool as it is taken so it can never encrypt two messages.
+    
+    Pools are kept for at most maxKeys recipients, the least recently registered or used is dropped (with its
+    pairs) to make room for another
+    '''
+    def __init__(self, lgGroupSize, random, *, target = 256, batchSize = 64, block = True, maxKeys = 1024):
+        '''
+        @param target - The depth the worker keeps each pool filled to
+        @param batchSize - The number of pairs computed at a time
+        @param block - Should an empty pool compute a pair on demand (or raise PoolExhaustedError)
+        @param maxKeys - The most recipients to keep pools for (None for no limit)
+        '''
+        self.lgGroupSize = lgGroupSize
+        self.random = random
+        self.target = target
+        self.batchSize = batchSize
+        self.block = block
+        self.maxKeys = maxKeys
+        
+        # (mod, generator, publicKey) -> deque of (ephemeralPublicKey, sharedSecret) int pairs, least recently used first
+        self.pools = OrderedDict()
+        self.lock = threading.Lock()
+        
+        self.produced = 0
+        self.consumed = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self.worker = None
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        
+    def register(self, publicKeys):
+        '''
+        Start keeping pools for each (mod, generator, publicKey) triple in publicKeys
+        '''
+        with self.lock:
+            for key in publicKeys:
+                self._pool(tuple(key))
+        self.wake.set()
+        
+    def unregister(self, publicKeys):
+        '''
+        Stop keeping pools for each (mod, generator, publicKey) triple in publicKeys, dropping their unused pairs
+        '''
+        with self.lock:
+            for key in publicKeys:
+                self.pools.pop(tuple(key), None)
+        
+    def _pool(self, key):
+        # The pool for key as the most recently used (call with the lock held)
+        pool = self.pools.get(key)
+        if pool is not None:
+            self.pools.move_to_end(key)
+            return pool
+        
+        pool = self.pools[key] = deque()
+        while self.maxKeys is not None and len(self.pools) > self.maxKeys:
+            self.pools.popitem(last=False)
+            self.evictions += 1
+        return pool
+        
+    def _compute(self, key, count):
+        mod, generator, publicKey = key
+        ephemeralSecretKeys = [self.random.randrange(2**self.lgGroupSize) for i in range(count)]
+        if native:
+            # Encrypting 1 gives exactly (generator**r, publicKey**r)
+            return [tuple(ElGamalGF2.encrypt(1, publicKey, generator, mod, r)) for r in ephemeralSecretKeys]
+        if GF2Array is not None and self.lgGroupSize <= 64:
+            ephemeralPublicKeys = GF2Array.full(generator, count, self.lgGroupSize, mod) ** ephemeralSecretKeys
+            sharedSecrets = GF2Array.full(publicKey, count, self.lgGroupSize, mod) ** ephemeralSecretKeys
+            return list(zip(ephemeralPublicKeys, sharedSecrets))
+        GF2Gen = lambda x: GF2(value=x, size=self.lgGroupSize, mod=mod)
+        return [(int(GF2Gen(generator)**r), int(GF2Gen(publicKey)**r)) for r in ephemeralSecretKeys]
+        
+    def fill(self, key, count = None):
+        '''
+        Compute count pairs for key (by default enough to reach target, a batch at a time)
+        
+        @return - The number of pairs added
+        '''
+        key = tuple(key)
+        if count is None:
+            count = max(0, self.target - self.depth(key))
+        
+        added = 0
+        while added < count:
+            pairs = self._compute(key, min(self.batchSize, count - added))
+            with self.lock:
+                self._pool(key).extend(pairs)
+                self.produced += len(pairs)
+            added += len(pairs)
+        return added
+        
+    def _refill(self, key, count):
+        # Like fill, but the pairs are dropped if key was unregistered or evicted while they were computed
+        pairs = self._compute(key, count)
+        with self.lock:
+            pool = self.pools.get(key)
+            if pool is not None:
+                pool.extend(pairs)
+                self.produced += len(pairs)
+        
+    def take(self, key):
+        '''
+        Remove a pair from the pool of key, computing one if the pool is empty
+        
+        @return - (ephemeralPublicKey, sharedSecret) as ints
+        '''
+        key = tuple(key)
+        with self.lock:
+            pool = self._pool(key)
+            pair = pool.popleft() if pool else None
+            low = len(pool) < self.target // 2
+        
+        if low:
+            self.wake.set()
+        
+        if pair is None:
+            if not self.block:
+                raise PoolExhaustedError('No precomputed pairs for %r' % (key,))
+            pair = self._compute(key, 1)[0]
+            with self.lock:
+                self.misses += 1
+                self.produced += 1
+        
+        with self.lock:
+            self.consumed += 1
+        return pair
+        
+    def encrypt(self, message, key):
+        '''
+        Encrypt message for the recipient with (mod, generator, publicKey) key using a precomputed pair
+        
+        @return - (ephemeralPublicKey, c2) as ints
+        '''
+        ephemeralPublicKey, sharedSecret = self.take(key)
+        mod = key[0]
+        return (ephemeralPublicKey, int(GF2(value=sharedSecret, size=self.lgGroupSize, mod=mod) * int(message)))
+        
+    def depth(self, key = None):
+        '''
+        The number of pairs ready for key (or for every key together)
+        '''
+        with self.lock:
+            if key is None:
+                return sum(len(pool) for pool in self.pools.values())
+            return len(self.pools.get(tuple(key), ()))
+        
+    def _run(self):
+        while not self.stopping.is_set():
+            with self.lock:
+                low = [key for key, pool in self.pools.items() if len(pool) < self.target]
+            for key in low:
+                if self.stopping.is_set():
+                    break
+                count = min(self.batchSize, self.target - self.depth(key))
+                if count > 0:
+                    self._refill(key, count)
+            if not low:
+                self.wake.wait()
+                self.wake.clear()
+        
+    def start(self):
+        '''
+        Start a background thread that keeps every registered pool filled to target
+        '''
+        if self.worker is None:
+            self.stopping.clear()
+            self.worker = threading.Thread(target=self._run, name='EphemeralPool', daemon=True)
+            self.worker.start()
+        
+    def stop(self):
+        if self.worker is not None:
+            self.stopping.set()
+            self.wake.set()
+            self.worker.join()
+            self.worker = None
+        
+    def stats(self):
+        with self.lock:
+            depths = [len(pool) for pool in self.pools.values()]
+            return {'keys': len(depths),
+                    'depth': sum(depths),
+                    'minDepth': min(depths, default = 0),
+                    'maxDepth': max(depths, default = 0),
+                    'produced': self.produced,
+                    'consumed': self.consumed,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'hitRate': 1 - self.misses / self.consumed if self.consumed else 0.0}
+
 class DecryptionError(Exception):
     pass
 
@@ -0,0 +1,112 @@
+import hashlib
+import shelve
+import weakref
+from collections import OrderedDict
+
+from interning import InternCache
+
+def contentKey(*parts):
+    '''
+    A digest of the inputs to a computation, so equal inputs find the same checkpoint
+
+    @param parts - ints, None and (nested) tuples or lists of them
+    '''
+    return hashlib.sha256(repr(parts).encode()).digest()
+
+def packInts(values, size):
+    '''
+    Pack a sequence of GF(2^size) elements as ints (None for missing entries) into bytes, so a checkpoint costs
+    a few bytes per entry rather than a Python int each
+
+    @return - (data, present) where data holds ceil(size/8) big endian bytes per entry and present has a byte
+              per entry
+    '''
+    width = (size + 7) // 8
+    data = b''.join((0 if v is None else int(v)).to_bytes(width, 'big') for v in values)
+    return data, bytes(v is not None for v in values)
+
+def unpackInts(packed, size):
+    '''
+    The list of ints (and None) packed by packInts
+    '''
+    data, present = packed
+    width = (size + 7) // 8
+    return [int.from_bytes(data[i * width:(i + 1) * width], 'big') if p else None for i, p in enumerate(present)]
+
+class CheckpointCache(InternCache):
+    '''
+    A size bounded cache of intermediate results keyed by the contentKey of their inputs
+
+    If spill is given, entries evicted from memory are written to a shelve file at that path and read back
+    (instead of being recomputed) the next time they are needed. The file holds at most spillSize entries, the
+    oldest are deleted to make room and an entry is deleted from it once it is read back into memory.
+
+    Use it in a with statement (or call close) to close the spill file
+    '''
+    def __init__(self, maxsize = 0, *, spill = None, spillSize = 4096):
+        super().__init__(maxsize)
+        self.spillSize = spillSize
+        self.spillHits = 0
+
+        # The hex keys in the spill file, oldest first
+        self.spilled = OrderedDict()
+
+        self.spill = None
+        if spill is not None:
+            self.spill = shelve.open(spill)
+            self.closer = weakref.finalize(self, self.spill.close)
+            self.spilled = OrderedDict.fromkeys(self.spill.keys())
+            self._trimSpill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key, factory):
+        if self.maxsize > 0 and self.spill is not None and key not in self.entries:
+            try:
+                value = self.spill.pop(key.hex())
+            except KeyError:
+                pass
+            else:
+                del self.spilled[key.hex()]
+                self.hits += 1
+                self.spillHits += 1
+                return self._store(key, value)
+        return super().get(key, factory)
+
+    def _evict(self):
+        key, value = self.entries.popitem(last=False)
+        self.evictions += 1
+        if self.spill is not None:
+            self.spill[key.hex()] = value
+            self.spilled[key.hex()] = None
+            self._trimSpill()
+
+    def _trimSpill(self):
+        while len(self.spilled) > self.spillSize:
+            key, _ = self.spilled.popitem(last=False)
+            del self.spill[key]
+
+    def clear(self):
+        super().clear()
+        self.spillHits = 0
+        if self.spill is not None:
+            self.spill.clear()
+            self.spilled.clear()
+
+    def close(self):
+        '''
+        Close the spill file (the checkpoints in it are kept for the next CheckpointCache opened at the same path)
+        '''
+        if self.spill is not None:
+            self.closer()
+            self.spill = None
+
+    def stats(self):
+        stats = super().stats()
+        stats['spilled'] = len(self.spilled)
+        stats['spillHits'] = self.spillHits
+        return stats
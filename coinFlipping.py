@@ -1,26 +1,103 @@
 import time
 import math
-from functools import reduce
 
 from gf2 import GF2
-from polynomial import Polynomial
+from polynomial import Polynomial, constantPolynomial, evaluateMany, extractInto, extractChunks, parityCheckMatrix, syndrome, interpolateBasis
+from interning import fieldCache, InternCache
+from shareMatrix import ShareMatrix, storage
+from checkpoint import CheckpointCache, contentKey, packInts, unpackInts
 
 from gf2 import findRandomIrreduciblePolynomial
-from gf2 import findRandomGeneratorPolynomial 
+from groupOrder import findGenerator, randomUnit
     
 import ElGamal
 
 try:
     from interpolateGF2 import interpolatePolynomial as interpolate
     from interpolateGF2 import decodeReedSolomon as decodeRS
-    interpolatePolynomial = lambda points, polyMod, size: Polynomial(coefficients=[GF2(value=i, size=size, mod=polyMod) for i in interpolate(points, polyMod)])
-    decodePolynomial = lambda points, k, polyMod, size: Polynomial(coefficients=[GF2(value=i, size=size, mod=polyMod) for i in decodeRS(points, k, polyMod)])
+    try:
+        # Keep results as native polynomials so they never become Python lists
+        from interpolateGF2 import PolyGF2
+        from interpolateGF2 import interpolate as interpolateNative
+        from interpolateGF2 import decode as decodeNative
+        interpolatePolynomial = lambda points, polyMod, size: interpolateNative(points, polyMod)
+        decodePolynomial = lambda points, k, polyMod, size: decodeNative(points, k, polyMod)
+        zeroPolynomial = lambda polyMod, size: PolyGF2([0], polyMod)
+        buildPolynomial = lambda coefficients, polyMod, size: PolyGF2(coefficients, polyMod)
+        nativeInterpolation = True
+    except ImportError:
+        interpolatePolynomial = lambda points, polyMod, size: Polynomial(coefficients=[GF2(value=i, size=size, mod=polyMod) for i in interpolate(points, polyMod)])
+        decodePolynomial = lambda points, k, polyMod, size: Polynomial(coefficients=[GF2(value=i, size=size, mod=polyMod) for i in decodeRS(points, k, polyMod)])
+        zeroPolynomial = lambda polyMod, size: constantPolynomial(fieldConstant(0, size, polyMod))
+        buildPolynomial = lambda coefficients, polyMod, size: Polynomial(coefficients=[GF2(value=i, size=size, mod=polyMod) for i in coefficients])
+        nativeInterpolation = True
 except ImportError:
     from polynomial import interpolatePolynomial as interpolate
+    from polynomial import decodeReedSolomon as decodeRS
     interpolatePolynomial = lambda points, polyMod, size: Polynomial(coefficients=interpolate(points))[0]
+    decodePolynomial = lambda points, k, polyMod, size: decodeRS(points, k)[0]
+    zeroPolynomial = lambda polyMod, size: constantPolynomial(fieldConstant(0, size, polyMod))
+    buildPolynomial = lambda coefficients, polyMod, size: Polynomial(coefficients=[GF2(value=i, size=size, mod=polyMod) for i in coefficients])
+    nativeInterpolation = False
+
+def newDecodeStats():
+    '''
+    Counts of how each column was decoded: 'fast' (optimisticDecode found no errors), 'full' (the error correcting
+    decoder ran), 'screened' (the parity check passed so it was not decoded) and 'checkpointed' (a retry reused it)
+    '''
+    return {'fast': 0, 'full': 0, 'screened': 0, 'checkpointed': 0}
+
+def optimisticDecode(points, k, degree, polyMod, size, *, stats = None, basis = None):
+    '''
+    Decode assuming none of the points are corrupted
+    
+    Interpolates the first degree+1 points and checks the rest against the result, only running the
+    error correcting decoder if one of them disagrees
+    
+    @param points - The (x, y) points to decode
+    @param k - The parameter to pass to decodePolynomial
+    @param degree - The largest degree an honest polynomial can have
+    @param stats - A dictionary from newDecodeStats to count the path taken in
+    @param basis - The Lagrange basis of the first degree+1 x values (so it is not recomputed)
+    
+    @return - The decoded polynomial
+    '''
+    if stats is None:
+        stats = newDecodeStats()
+    
+    if len(points) > degree:
+        if basis is None:
+            poly = interpolatePolynomial(points[:degree+1], polyMod, size)
+        else:
+            poly = interpolateBasis(basis, [y for x, y in points[:degree+1]])
+        rest = points[degree+1:]
+        if all(y == value for (x, y), value in zip(rest, evaluateMany(poly, [x for x, y in rest]))):
+            stats['fast'] += 1
+            return poly
+    
+    stats['full'] += 1
+    return decodePolynomial(points, k, polyMod, size)
+
+# Hosts without the ElGamal C extension decrypt and encrypt a whole row at a time with NumPy
+vectorizeRows = ElGamal.GF2Array is not None and not ElGamal.native
+
+def rowsVectorized(size):
+    '''
+    Should rows of GF(2^size) keys go through the NumPy row functions (GF2Array holds at most 64 bits)
+    '''
+    return vectorizeRows and size <= 64
+
+def decodeHitRate(stats):
+    '''
+    The fraction of columns in stats (see newDecodeStats) that did not need the error correcting decoder
+    '''
+    total = sum(stats.values())
+    if total == 0:
+        return 0.0
+    return (total - stats['full']) / total
 
 getMod = lambda size, random: findRandomIrreduciblePolynomial(size, random)
-getGen = lambda mod, size, random: findRandomGeneratorPolynomial(size, mod, random)
+getGen = lambda mod, size, random: findGenerator(size, mod, random)
 getKey = lambda gen, size, random: ElGamal.ElGamal(generator=gen, lgGroupSize=size, random=random)
 
 hardcodedKeys = {
@@ -96,14 +173,8 @@ def genKey(size, random, *, hardcode = False):
         m, g = hardcodedKeys[size][random.randrange(len(hardcodedKeys[size]))]
         g = GF2(value=g, size=size, mod=m)
         
-        from gf2.gf2_math import _exteuc
-        
-        # Find s such that s and 2**size-1 are coprime
-        s = random.randrange(1, 2**size)
-        while _exteuc(s, 2**size-1)[0] != 1:
-            s = random.randrange(1, 2**size)
-        
-        g = g**s
+        # Rerandomize the generator with an s coprime to 2**size-1
+        g = g**randomUnit(size, random)
     
     if m is None or g is None:
         m = getMod(size, random)
@@ -112,11 +183,159 @@ def genKey(size, random, *, hardcode = False):
     k = getKey(g, size, random)
     return (m, g, k)
 
+def fieldConstant(value, size, mod):
+    '''
+    A GF2 element used as a constant, shared when interning is enabled
+    '''
+    return fieldCache.get((value, size, mod), lambda: GF2(value=value, size=size, mod=mod))
+
+# Parity check matrices keyed by (n, degree, size, polyMod)
+parityCache = InternCache(maxsize = 64)
+
+def parityCheck(n, degree, size, polyMod):
+    '''
+    The parity check matrix for a column of shares dealt at x = degree+1, ..., degree+n
+    '''
+    def build():
+        xs = [fieldConstant(shareIndex + degree + 1, size, polyMod) for shareIndex in range(n)]
+        return parityCheckMatrix(xs, degree)
+    return parityCache.get((n, degree, size, polyMod), build)
+
+# Whether secretKey is the witness for publicKey, keyed by (publicKey, secretKey, size) so each pair is only checked once
+# Only the verdict is kept. A round has n*n pairs, so callers reconstructing rounds of more than 64 parties can
+# grow the cache to hold them (see reserveKeys)
+keyCache = InternCache(maxsize = 4096)
+
+def reserveKeys(count):
+    '''
+    Grow keyCache to hold at least count keys (unless it was turned off with keyCache.resize(0))
+    '''
+    if keyCache.enabled() and keyCache.maxsize < count:
+        keyCache.resize(count)
+
+def loadKey(publicKey, secretKey, size):
+    '''
+    Check a party's revealed secret key against its public key
+    
+    The verdict is cached in keyCache (keyCache.resize(0) turns this off)
+    
+    @param publicKey - The (mod, generator, publicKey) triple published by the party
+    @param secretKey - The secret key revealed by the party
+    @param size - The number of bits of the key
+    
+    @return - The (mod, secretKey) ints to decrypt with (see decryptInts) or False if secretKey is not the
+              witness for publicKey
+    '''
+    publicKey = tuple(publicKey)
+    if not keyCache.get((publicKey, secretKey, size), lambda: _verifyKey(publicKey, secretKey, size)):
+        return False
+    return (publicKey[0], secretKey)
+
+def _verifyKey(publicKey, secretKey, size):
+    mod, generator, publicKey = publicKey
+    return int(GF2(value=generator, size=size, mod=mod)**secretKey) == publicKey
+
+def encryptCells(messages, publicKeys, size, random):
+    '''
+    Encrypt messages[i] with the (mod, generator, publicKey) triple publicKeys[i]
+    
+    @return - A list of (ephemeralPublicKey, c2) int pairs
+    '''
+    # Encrypt them all at once straight from the triples
+    if rowsVectorized(size):
+        mods, generators, keys = zip(*publicKeys)
+        return ElGamal.encryptRow(messages, generators, keys, mods, size, random)
+    
+    GF2Gen = lambda x, mod: GF2(value=x, size=size, mod=mod)
+    keys = [ElGamal.ElGamal(generator=GF2Gen(generator, mod), lgGroupSize=size, random=random, publicKey=GF2Gen(publicKey, mod)) for mod, generator, publicKey in publicKeys]
+    return [tuple(map(int, key.encrypt(message))) for key, message in zip(keys, messages)]
+
+def decryptInts(key, ephemeralPublicKey, c2, size):
+    '''
+    Decrypt the ciphertext (ephemeralPublicKey, c2) of ints with the (mod, secretKey) key from loadKey
+    
+    @return - The message as an int
+    '''
+    mod, secretKey = key
+    
+    # The C extension works on ints, only the pure Python ElGamal needs field elements
+    if not ElGamal.native:
+        GF2Gen = lambda x: GF2(value=x, size=size, mod=mod)
+        ephemeralPublicKey, c2 = GF2Gen(ephemeralPublicKey), GF2Gen(c2)
+    return int(ElGamal.decrypt((ephemeralPublicKey, c2), secretKey, modulus = mod))
+
+def decryptCells(publicKeys, secretKeys, c1, c2, present, size):
+    '''
+    Decrypt the ciphertexts (c1[i], c2[i]) with the (mod, generator, publicKey) triple publicKeys[i] and the secret
+    key secretKeys[i] revealed for it, checking each secret key is the witness for its public key
+    
+    @param c1, c2 - The halves of the ciphertexts as sequences of ints (such as the rows of a ShareMatrix)
+    @param present - Whether each ciphertext was received
+    
+    @return - (shares, warnings) where shares[i] is the decrypted int (None if it could not be decrypted) and
+              warnings[i] is None, 'Aborted' or 'Malicious'
+    '''
+    shares = [None] * len(present)
+    warnings = [None] * len(present)
+    
+    # Check that all data is available
+    available = []
+    for i, received in enumerate(present):
+        if publicKeys[i] is None or secretKeys[i] is None or not received:
+            warnings[i] = 'Aborted'
+        elif c1[i] == 0:
+            # An ephemeral public key of 0 is not in the group (and its shared secret could not be divided by)
+            warnings[i] = 'Malicious'
+        else:
+            available.append(i)
+    
+    if not rowsVectorized(size):
+        for i in available:
+            key = loadKey(publicKeys[i], secretKeys[i], size)
+            if key is False:
+                warnings[i] = 'Malicious'
+                continue
+            shares[i] = decryptInts(key, c1[i], c2[i], size)
+        return shares, warnings
+    
+    # Only the witnesses that are not in keyCache are checked, all at once
+    cacheKey = lambda i: (tuple(publicKeys[i]), secretKeys[i], size)
+    verdicts = {i: keyCache.lookup(cacheKey(i)) for i in available}
+    unknown = [i for i in available if verdicts[i] is None]
+    if unknown:
+        valid = ElGamal.verifyRow([publicKeys[i][1] for i in unknown], [secretKeys[i] for i in unknown], [publicKeys[i][2] for i in unknown], [publicKeys[i][0] for i in unknown], size)
+        for i, ok in zip(unknown, valid):
+            verdicts[i] = keyCache.store(cacheKey(i), ok)
+    
+    for i in available:
+        if not verdicts[i]:
+            warnings[i] = 'Malicious'
+    available = [i for i in available if verdicts[i]]
+    
+    if available:
+        # A complete row is decrypted straight from its storage
+        if len(available) < len(present):
+            c1 = [c1[i] for i in available]
+            c2 = [c2[i] for i in available]
+        values = ElGamal.decryptRow(c1, c2, [secretKeys[i] for i in available], [publicKeys[i][0] for i in available], size)
+        for i, share in zip(available, values):
+            shares[i] = share
+    return shares, warnings
+
 class CoinFlipping:
     '''
     An algorithm to generate randomness as long as more than half of the parties are honest
     '''
-    def __init__(self, n, lgSize, random):
+    def __init__(self, n, lgSize, random, *, optimistic = True, screen = True, packing = 0, checkpoints = None, pool = None):
+        '''
+        @param packing - Extra degrees for each dealer's polynomial. Each one adds another block of randomness
+                         to every round but the decoder can survive one less missing share (see faultTolerance)
+        @param checkpoints - A CheckpointCache for decrypted rows and decoded polynomials, so a retried reconstruct
+                             only redoes what changed (CheckpointCache(maxsize = 2 * n) holds a whole round).
+                             Off by default since a reconstruct that is never retried gains nothing from it
+        @param pool - An ElGamal.EphemeralPool to encrypt shares with precomputed pairs (register the recipients'
+                      public keys with it ahead of time)
+        '''
         
         # Number of parties
         self.n = n
@@ -124,7 +343,12 @@ class CoinFlipping:
         # Max number of corruptions
         self.t = self.n // 2
         
-        # The number of bits for each party to generate (for a total of self.size * self.t)
+        # The degree of each dealer's polynomial, also the number of blocks of randomness per round
+        self.degree = self.t + packing
+        if not 0 <= packing or self.degree >= self.n:
+            raise ValueError('packing must be between 0 and %d for %d parties' % (self.n - self.t - 1, self.n))
+        
+        # The number of bits for each party to generate (for a total of self.size * self.degree)
         self.size = lgSize
         
         # The randomness to use
@@ -148,6 +372,21 @@ class CoinFlipping:
         self.summedPoly = None
         self.userWarnings = [None] * self.n
         
+        # Try interpolating before running the error correcting decoder
+        self.optimistic = optimistic
+        self.decodeStats = newDecodeStats()
+        
+        # Sum complete columns with a zero syndrome without decoding them
+        self.screen = screen
+        
+        # Decrypted rows and decoded polynomials keyed by the contentKey of their inputs
+        self.checkpoints = checkpoints
+        if self.checkpoints is None:
+            self.checkpoints = CheckpointCache()
+        
+        # Precomputed (generator**r, publicKey**r) pairs to encrypt with
+        self.pool = pool
+        
     def __repr__(self):
         return '%s' % ((self.n, self.size, self.publicKeys, self.privateKeys, self.gfpoly, self.deal, self.encDeal, self.summedPoly),) 
         
@@ -162,9 +401,9 @@ class CoinFlipping:
         
         return self.publicKeys
         
-    def share(self, sharedPublicKeys, polyMod = None, *, _testing = None):
+    def dealShares(self, polyMod = None, *, _testing = None):
         '''
-        Given public keys from other parties generate and share a random polynomial
+        Generate a random polynomial and evaluate it at each party's point
         '''
         
         if polyMod is None:
@@ -172,8 +411,8 @@ class CoinFlipping:
         else:
             self.polyMod = polyMod
         
-        # Generate t+1 random coefficients
-        coefficients = [GF2(value=self.random.randrange(0, 2**self.size), size=self.size, mod=self.polyMod) for i in range(self.t+1)]
+        # Generate degree+1 random coefficients
+        coefficients = [GF2(value=self.random.randrange(0, 2**self.size), size=self.size, mod=self.polyMod) for i in range(self.degree+1)]
         
         # Used for testing to allow a party to change the degree of the polynomial
         if _testing is not None and 'degree' in _testing:
@@ -183,99 +422,462 @@ class CoinFlipping:
         self.gfpoly = Polynomial(coefficients = coefficients)        
         
         # Deal out the polynomial
-        self.deal = [self.gfpoly(i + self.t + 1) for i in range(self.n)]        
+        self.deal = [self.gfpoly(i + self.degree + 1) for i in range(self.n)]
         
-        # Determine which keys to use
-        sharedPublicKeys = [ElGamal.ElGamal(generator=GF2(value=generator, size=self.size, mod=mod), lgGroupSize=self.size, random=self.random, publicKey=GF2(value=publicKey, size=self.size, mod=mod)) for mod, generator, publicKey in sharedPublicKeys]
+        return self.deal
+        
+    def share(self, sharedPublicKeys, polyMod = None, *, _testing = None):
+        '''
+        Given public keys from other parties generate and share a random polynomial
+        '''
+        self.dealShares(polyMod, _testing = _testing)
+        
+        # Online encryption is a single multiplication with a precomputed pair
+        if self.pool is not None:
+            self.encDeal = [self.pool.encrypt(int(share), key) for share, key in zip(self.deal, sharedPublicKeys)]
+            return self.encDeal
         
         # Encrypt each share with the apropriate public key
-        self.encDeal = [tuple(map(int, sharedPublicKeys[i].encrypt(self.deal[i]))) for i in range(self.n)]
+        self.encDeal = encryptCells([int(share) for share in self.deal], sharedPublicKeys, self.size, self.random)
         
         return self.encDeal
         
-    def reconstruct(self, encShares, sharedPublicKeys, sharedSecretKeys, polyMod):
+    def reconstruct(self, encShares, sharedPublicKeys, sharedSecretKeys, polyMod, *, out = None):
         '''
         @param list<list<int>> encShares - An array of encrypted shares to be reconstructed
+        @param out - A bytearray or writable memoryview to write the randomness into (see combine)
         '''
-        # Transpose the encrypted shares array so that each row (instead of each column) can be decrypted by a single user
-        encShares = list(zip(*encShares))
+        # Warnings from an earlier attempt are found again if they still apply
+        self.userWarnings = [None] * self.n
+        
+        # Store the encrypted shares column wise, the transposed view lets each row (instead of each column) be decrypted by a single user
+        c1, c2 = ShareMatrix.fromCiphertexts(encShares, self.n, self.size)
+        c1, c2 = c1.T, c2.T
         
         # Decrypt all of the shares
-        shares = []
-        shareIndex = 0
-        GF2GenPoly = lambda x: GF2(value=x, size=self.size, mod=polyMod)
-        for publicKeyRow, secretKeyRow, encSharesRow in zip(sharedPublicKeys, sharedSecretKeys, encShares):
+        shares = ShareMatrix(self.n, self.n, size = self.size)
+        for shareIndex, (publicKeyRow, secretKeyRow) in enumerate(zip(sharedPublicKeys, sharedSecretKeys)):
             
             # Check that all data is available
-            if publicKeyRow is None or secretKeyRow is None or encSharesRow is None:
-                shares.append([None] * self.n)
+            if publicKeyRow is None or secretKeyRow is None:
                 self.userWarnings[shareIndex] = 'Aborted'
-                shareIndex += 1
                 continue
             
-            # A row of decrypted shares
-            sharesRow = []
-            
-            for publicKey, secretKey, encShare in zip(publicKeyRow, secretKeyRow, encSharesRow):
-                # Check that all data is available
-                if publicKey is None or secretKey is None or encShare is None:
-                    sharesRow.append(None)
-                    self.userWarnings[shareIndex] = 'Aborted'
-                    continue
-                
-                # Seperate the public key
-                mod, generator, publicKey = publicKey
-                
-                GF2Gen = lambda x: GF2(value=x, size=self.size, mod=mod)
-                
-                # Cast generator, secretKey and encShare into GF2 elements
-                generator = GF2Gen(generator)
-                secretKey = GF2Gen(secretKey)
-                encShare = tuple(map(GF2Gen, encShare))
-                
-                key = ElGamal.ElGamal(generator=generator, lgGroupSize=self.size, random=self.random, secretKey=secretKey)
-                
-                # Unique witness detection (check that the public key generated from the secret key is the same as the original public key)
-                if int(key.publicKey) != publicKey:
-                    sharesRow.append(None)
-                    self.userWarnings[shareIndex] = 'Malicious'
-                    continue
-                
-                # Decrypt the share
-                share = int(key.decrypt(encShare))
-                
-                # Cast share into a GF2 element
-                share = GF2GenPoly(share)
-                
-                # Add share to row
-                sharesRow.append((GF2GenPoly(shareIndex + self.t + 1), share))
-                
-            shareIndex += 1
-            shares.append(sharesRow)
+            row = self.decryptCiphertexts(shareIndex, publicKeyRow, secretKeyRow, c1.values(shareIndex), c2.values(shareIndex), c1.presence(shareIndex))
+            for i, share in enumerate(row):
+                shares[shareIndex, i] = share
             
-        # Transpose the shares so each row corrosponds to a polynomial
-        shares = list(zip(*shares))
+        # The transposed view has a row for each polynomial
+        shares = shares.T
+        
+        GF2GenPoly = lambda x: GF2(value=x, size=self.size, mod=polyMod)
+        xs = [fieldConstant(shareIndex + self.degree + 1, self.size, polyMod) for shareIndex in range(self.n)]
+        
+        # Points are only built for one polynomial at a time (erased shares are left out)
+        pointList = (shares.points(i, xs, GF2GenPoly) for i in range(self.n))
+        
+        polynomials, screened = self.decodeColumns(pointList, polyMod)
+        
+        return self.combine(polynomials, polyMod, out = out, screened = screened)
+    
+    def decryptShare(self, shareIndex, publicKey, secretKey, encShare, polyMod, *, key = None):
+        '''
+        Decrypt the share a dealer sent to party shareIndex
+        
+        @param shareIndex - The index of the party the share was sent to
+        @param publicKey - The (mod, generator, publicKey) triple the share was encrypted with
+        @param secretKey - The secret key revealed by the party for publicKey
+        @param encShare - The encrypted share
+        @param polyMod - The modulus of the shared polynomials
+        @param key - A key previously built by loadKey for (publicKey, secretKey)
+        
+        @return - The point (x, y) on the dealer's polynomial or None if the share could not be decrypted
+        '''
+        share = self.decryptValue(shareIndex, publicKey, secretKey, encShare, key = key)
+        if share is None:
+            return None
+        
+        return (fieldConstant(shareIndex + self.degree + 1, self.size, polyMod), GF2(value=share, size=self.size, mod=polyMod))
+    
+    def decryptRow(self, shareIndex, publicKeyRow, secretKeyRow, encSharesRow):
+        '''
+        Decrypt every share sent to party shareIndex (see decryptCiphertexts)
         
-        # Remove null values
-        pointList = [list(filter(lambda x: x is not None, points)) for points in shares]
+        @param encSharesRow - The encrypted shares sent to the party (None for each share that was not received)
         
-        # Use the first t+2 points to interpolate a unique polynomial
-        polynomials = [decodePolynomial(points, self.t-(self.n-len(points)), polyMod, self.size) for points in pointList]
+        @return - A list of the shares as ints (None where a share could not be decrypted)
+        '''
+        present = [encShare is not None for encShare in encSharesRow]
+        c1 = storage(len(encSharesRow), self.size)
+        c2 = storage(len(encSharesRow), self.size)
+        for i, encShare in enumerate(encSharesRow):
+            if encShare is not None:
+                c1[i], c2[i] = map(int, encShare)
+        return self.decryptCiphertexts(shareIndex, publicKeyRow, secretKeyRow, c1, c2, present)
+    
+    def decryptCiphertexts(self, shareIndex, publicKeyRow, secretKeyRow, c1, c2, present):
+        '''
+        Decrypt every share sent to party shareIndex from the halves of its ciphertexts, reusing the checkpoint if
+        the row was decrypted before
+        
+        @param c1, c2 - The halves of the encrypted shares (see ShareMatrix.values)
+        @param present - Whether each share was received
+        
+        @return - A list of the shares as ints (None where a share could not be decrypted)
+        '''
+        if not self.checkpoints.enabled():
+            return self._decryptRow(shareIndex, publicKeyRow, secretKeyRow, c1, c2, present)
+        
+        def decrypt():
+            row = self._decryptRow(shareIndex, publicKeyRow, secretKeyRow, c1, c2, present)
+            return packInts(row, self.size), self.userWarnings[shareIndex]
+        
+        key = contentKey('decryptRow', self.size, publicKeyRow, secretKeyRow, c1, c2, present)
+        row, warning = self.checkpoints.get(key, decrypt)
+        if warning is not None:
+            self.userWarnings[shareIndex] = warning
+        return unpackInts(row, self.size)
+    
+    def _decryptRow(self, shareIndex, publicKeyRow, secretKeyRow, c1, c2, present):
+        shares, warnings = decryptCells(publicKeyRow, secretKeyRow, c1, c2, present, self.size)
+        for warning in warnings:
+            if warning is not None:
+                self.userWarnings[shareIndex] = warning
+        return shares
+    
+    def decryptValue(self, shareIndex, publicKey, secretKey, encShare, *, key = None):
+        '''
+        Decrypt the share a dealer sent to party shareIndex as an int (see decryptShare)
+        
+        @return - The share or None if it could not be decrypted
+        '''
+        # Check that all data is available
+        if publicKey is None or secretKey is None or encShare is None:
+            self.userWarnings[shareIndex] = 'Aborted'
+            return None
+        
+        if key is None:
+            key = loadKey(publicKey, secretKey, self.size)
+        
+        # Unique witness detection (check that the public key generated from the secret key is the same as the original public key)
+        # The ephemeral public key must be in the group (see decryptCells)
+        if key is False or int(encShare[0]) == 0:
+            self.userWarnings[shareIndex] = 'Malicious'
+            return None
+        
+        # Decrypt the share
+        return decryptInts(key, *encShare, self.size)
+    
+    def decodeColumns(self, pointList, polyMod, *, basis = None):
+        '''
+        Decode every dealer's polynomial, except for complete columns that pass the parity check
+        
+        The columns that pass are codewords already, so they are added together and only their sum is interpolated
+        
+        @param basis - A function from the first degree+1 x values (as a tuple of ints) of a column to their
+                       Lagrange basis, to share bases between columns (see optimisticDecode)
+        
+        @return - (polynomials, screened) where polynomials has None for each column that passed and screened is
+                  the polynomial of their sum (None if no column passed)
+        '''
+        matrix = parityCheck(self.n, self.degree, self.size, polyMod) if self.screen else None
+        
+        polynomials = []
+        total = None
+        for points in pointList:
+            ys = [y for x, y in points]
+            if matrix is not None and len(points) == self.n and not any(int(s) for s in syndrome(matrix, ys)):
+                self.decodeStats['screened'] += 1
+                total = points if total is None else [(x, y + v) for (x, y), v in zip(total, ys)]
+                polynomials.append(None)
+            else:
+                polynomials.append(self.decode(points, polyMod, basis = basis))
+        
+        screened = None if total is None else interpolatePolynomial(total[:self.degree+1], polyMod, self.size)
+        return polynomials, screened
+    
+    def decode(self, points, polyMod, *, basis = None):
+        '''
+        Decode a dealer's polynomial from the points that survived decryption, reusing the checkpoint if
+        the same points were decoded before
         
+        @param basis - A function giving the Lagrange basis of the first degree+1 x values (see decodeColumns)
+        '''
+        if not self.checkpoints.enabled():
+            return self._decode(points, polyMod, basis)
+        
+        decoded = []
+        def decode():
+            decoded.append(True)
+            return packInts(self._decode(points, polyMod, basis).coefficients, self.size)
+        
+        # decodeK depends on n as well as the points
+        key = contentKey('decode', self.n, self.size, polyMod, self.degree, [(int(x), int(y)) for x, y in points])
+        coefficients = self.checkpoints.get(key, decode)
+        if not decoded:
+            self.decodeStats['checkpointed'] += 1
+        return buildPolynomial(unpackInts(coefficients, self.size), polyMod, self.size)
+    
+    def _decode(self, points, polyMod, basis = None):
+        if self.optimistic:
+            if basis is not None and len(points) > self.degree:
+                basis = basis(tuple(int(x) for x, y in points[:self.degree+1]))
+            else:
+                basis = None
+            return optimisticDecode(points, self.decodeK(points), self.degree, polyMod, self.size, stats = self.decodeStats, basis = basis)
+        self.decodeStats['full'] += 1
+        return decodePolynomial(points, self.decodeK(points), polyMod, self.size)
+    
+    def decodeHitRate(self):
+        '''
+        The fraction of this object's columns that did not need the error correcting decoder
+        '''
+        return decodeHitRate(self.decodeStats)
+    
+    def decodeK(self, points):
+        '''
+        The decoding parameter for a dealer's polynomial given the points that survived decryption
+        '''
+        return self.degree-(self.n-len(points))
+    
+    def faultTolerance(self):
+        '''
+        The number of parties that can abort (or have their shares erased) with every polynomial still decodable,
+        each party sending corrupted shares instead counts twice
+        '''
+        return self.n - self.degree - 1
+    
+    def combine(self, polynomials, polyMod, *, out = None, screened = None):
+        '''
+        Sum the valid decoded polynomials and extract the randomness from the result
+        
+        @param polynomials - The decoded polynomial of each dealer (None for dealers included in screened)
+        @param screened - The sum of the polynomials of the dealers that passed the parity check (see decodeColumns)
+        @param polyMod - The modulus of the shared polynomials
+        @param out - A bytearray or writable memoryview with room for degree * ceil(size/8) bytes to write the randomness into
+        
+        @return - The bytes of randomness generated this round (or out if it was given)
+        '''
         # Sum all of the valid polynomials together
-        self.summedPoly = Polynomial(coefficients = [GF2GenPoly(0)]) 
+        self.summedPoly = zeroPolynomial(polyMod, self.size) if screened is None else screened
         
         # Check that polynomials are of the correct degree
         for i, poly in enumerate(polynomials):
-            if poly.degree() > self.t:
+            if poly is None:
+                continue
+            if poly.degree() > self.degree:
                 polynomials[i] = None
                 self.userWarnings[i] = 'Malicious'
             else:
                 self.summedPoly += poly
         
-        # Evaluate and concatinate the sum of all of the valid polynomials
-        return reduce(lambda x, y: x + int(y).to_bytes(math.ceil(self.size/8), 'big'), (self.summedPoly(i) for i in range(self.t)), b'')
+        # Evaluate the sum of all of the valid polynomials straight into a single buffer
+        if out is None:
+            randomness = bytearray(self.degree * self.outputWidth())
+            extractInto(self.summedPoly, range(self.degree), self.outputWidth(), randomness)
+            return bytes(randomness)
+        extractInto(self.summedPoly, range(self.degree), self.outputWidth(), out)
+        return out
+    
+    def outputWidth(self):
+        '''
+        The number of bytes of randomness from each evaluation of summedPoly
+        '''
+        return math.ceil(self.size/8)
+    
+    def randomnessChunks(self, chunkSize = 4096):
+        '''
+        Yield the randomness of the last reconstruction chunkSize evaluations at a time
+        '''
+        return extractChunks(self.summedPoly, range(self.degree), self.outputWidth(), chunkSize)
+        
+class IncrementalReconstructor:
+    '''
+    Reconstruct a round's randomness as each party reveals its secret keys
+    
+    Each party's row of shares is decrypted as soon as it arrives. Once every dealer's points agree on a
+    polynomial of at most the dealt degree and the parties still missing are too few to out vote them
+    (points - missing > degree) the result can no longer change, so it is decoded and returned early.
+    '''
+    def __init__(self, coinFlipping, sharedPublicKeys, polyMod, *, deadline = None, clock = time.monotonic):
+        '''
+        @param coinFlipping - The CoinFlipping object to reconstruct with (and record warnings in)
+        @param sharedPublicKeys - The public key rows of every party
+        @param polyMod - The modulus of the shared polynomials
+        @param deadline - Seconds to wait for parties before they are marked as 'Aborted'
+        @param clock - The clock used for the deadline
+        '''
+        self.coinFlipping = coinFlipping
+        self.sharedPublicKeys = sharedPublicKeys
+        self.polyMod = polyMod
+        
+        self.clock = clock
+        self.deadline = None if deadline is None else self.clock() + deadline
+        
+        # The decrypted shares of each party (erased until the party arrives)
+        self.shares = ShareMatrix(self.coinFlipping.n, self.coinFlipping.n, size = self.coinFlipping.size)
+        self.arrived = [False] * self.coinFlipping.n
+        
+        self.randomness = None
+        
+    def remaining(self):
+        return self.arrived.count(False)
+        
+    def expired(self):
+        return self.deadline is not None and self.clock() >= self.deadline
+        
+    def addParty(self, shareIndex, secretKeyRow, encSharesRow, publicKeyRow = None):
+        '''
+        Decrypt the shares sent to a party now that its secret keys are known
         
+        @param shareIndex - The index of the party
+        @param secretKeyRow - The secret keys revealed by the party (None if it aborted)
+        @param encSharesRow - The encrypted shares every dealer sent to the party
+        @param publicKeyRow - The public keys of the party (defaults to its row of sharedPublicKeys)
+        
+        @return - The randomness if it has been determined, else None
+        '''
+        cf = self.coinFlipping
+        
+        if self.randomness is not None:
+            return self.randomness
+        
+        # Stragglers past the deadline are not waited for
+        if self.expired():
+            return self.finalize()
+        
+        if self.arrived[shareIndex]:
+            raise ValueError('Party %d has already been added' % shareIndex)
+        self.arrived[shareIndex] = True
+        
+        if publicKeyRow is None:
+            publicKeyRow = self.sharedPublicKeys[shareIndex]
+        
+        # Check that all data is available
+        if publicKeyRow is None or secretKeyRow is None or encSharesRow is None:
+            cf.userWarnings[shareIndex] = 'Aborted'
+        else:
+            for i, share in enumerate(cf.decryptRow(shareIndex, publicKeyRow, secretKeyRow, encSharesRow)):
+                self.shares[shareIndex, i] = share
+        
+        if self.remaining() == 0:
+            return self.finalize()
+        
+        return self._decodeEarly()
+        
+    def poll(self):
+        '''
+        Finalize the round if the deadline has passed
+        
+        @return - The randomness if it has been determined, else None
+        '''
+        if self.randomness is None and self.expired():
+            self.finalize()
+        return self.randomness
+        
+    def _points(self, i):
+        cf = self.coinFlipping
+        xs = [fieldConstant(shareIndex + cf.degree + 1, cf.size, self.polyMod) for shareIndex in range(cf.n)]
+        return self.shares.T.points(i, xs, lambda x: GF2(value=x, size=cf.size, mod=self.polyMod))
+        
+    def _decodeEarly(self):
+        cf = self.coinFlipping
+        missing = self.remaining()
+        
+        polynomials = []
+        for i in range(cf.n):
+            points = self._points(i)
+            
+            # The missing parties could still out vote these points
+            if len(points) - missing <= cf.degree:
+                return None
+            
+            # Some of the points are in error so wait for the full decode
+            poly = interpolatePolynomial(points, self.polyMod, cf.size)
+            if poly.degree() > cf.degree:
+                return None
+            polynomials.append(poly)
+        
+        self.randomness = cf.combine(polynomials, self.polyMod)
+        return self.randomness
+        
+    def finalize(self):
+        '''
+        Decode with the parties that have arrived, marking the rest as 'Aborted'
+        
+        @return - The randomness
+        '''
+        cf = self.coinFlipping
+        
+        if self.randomness is not None:
+            return self.randomness
+        
+        for shareIndex, arrived in enumerate(self.arrived):
+            if not arrived:
+                cf.userWarnings[shareIndex] = 'Aborted'
+        
+        pointList = [self._points(i) for i in range(cf.n)]
+        polynomials, screened = cf.decodeColumns(pointList, self.polyMod)
+        
+        self.randomness = cf.combine(polynomials, self.polyMod, screened = screened)
+        return self.randomness
+
+def packingBenchmark(n, lgSize, random, *, packings = None, rounds = 3):
+    '''
+    Compare the randomness produced per unit of work for each amount of packing
+    
+    The encryptions are counted from the ciphertexts each dealer produced and the decodes from the decodeStats
+    of each reconstruction (columns that pass the parity check are not decoded, only their sum is interpolated)
+    
+    @param packings - The packings to try (defaults to every valid packing)
+    @param rounds - The number of rounds to run for each packing
+    
+    @return - A list of dictionaries, one for each packing
+    '''
+    if packings is None:
+        packings = range(n - n // 2)
+    
+    results = []
+    for packing in packings:
+        parties = [CoinFlipping(n, lgSize, random, packing = packing) for i in range(n)]
+        for party in parties:
+            party.generateKeys(hardcode = True)
+        sharedPublicKeys = [party.publicKeys for party in parties]
+        sharedSecretKeys = [party.privateKeys for party in parties]
+        
+        randomness = 0
+        encryptions = 0
+        decodes = 0
+        shareTime = 0.0
+        reconstructTime = 0.0
+        for r in range(rounds):
+            polyMod = findRandomIrreduciblePolynomial(lgSize, random)
+            
+            start = time.perf_counter()
+            # party j's i-th key is used by dealer i to encrypt the share for party j
+            encShares = [party.share([parties[j].publicKeys[i] for j in range(n)], polyMod) for i, party in enumerate(parties)]
+            shareTime += time.perf_counter() - start
+            encryptions += sum(len(row) for row in encShares)
+            
+            start = time.perf_counter()
+            reconstructor = CoinFlipping(n, lgSize, random, packing = packing)
+            randomness += len(reconstructor.reconstruct(encShares, sharedPublicKeys, sharedSecretKeys, polyMod))
+            reconstructTime += time.perf_counter() - start
+            
+            stats = reconstructor.decodeStats
+            decodes += stats['fast'] + stats['full'] + (1 if stats['screened'] else 0)
+        
+        results.append({'packing': packing,
+                        'degree': parties[0].degree,
+                        'faultTolerance': parties[0].faultTolerance(),
+                        'bytesPerRound': randomness / rounds,
+                        'encryptionsPerRound': encryptions / rounds,
+                        'decodesPerRound': decodes / rounds,
+                        'bytesPerEncryption': randomness / encryptions if encryptions else 0.0,
+                        'bytesPerDecode': randomness / decodes if decodes else 0.0,
+                        'bytesPerShareSecond': randomness / shareTime,
+                        'bytesPerReconstructSecond': randomness / reconstructTime})
+    return results
                 
 if __name__ == '__main__':       
     def keygen(partyData, *, hardcode = False):
@@ -371,4 +973,9 @@ if __name__ == '__main__':
 
     print(publicSS)
     print(publicRandomness)
-    print(publicSS.userWarnings)    
\ No newline at end of file
+    print(publicSS.userWarnings)
+    
+    print()
+    print('packing  degree  faults  bytes/round  encryptions/round  decodes/round  bytes/encryption  bytes/decode  bytes/s (share)  bytes/s (reconstruct)')
+    for row in packingBenchmark(n, lgSize, random):
+        print('%7d  %6d  %6d  %11.1f  %17.0f  %13.1f  %16.3f  %12.2f  %15.0f  %21.0f' % tuple(row.values()))
@@ -0,0 +1,186 @@
+from array import array
+
+import numpy as np
+
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+
+def _values(x):
+    '''
+    Cast a GF2Array, GF2 element, int or sequence of them into uint64 values
+
+    An array('Q') is read in place rather than converted an element at a time
+    '''
+    if isinstance(x, GF2Array):
+        return x.values
+    if isinstance(x, np.ndarray):
+        return x.astype(np.uint64, copy=False)
+    if isinstance(x, array) and x.typecode == 'Q':
+        return np.frombuffer(x, dtype=np.uint64)
+    try:
+        return np.uint64(int(x))
+    except TypeError:
+        return np.array([int(i) for i in x], dtype=np.uint64)
+
+def _low(size, mod):
+    '''
+    The irreducible polynomial without its x^size term, which is what an overflow reduces to
+    '''
+    if isinstance(mod, (int, np.integer)):
+        return np.uint64(int(mod) ^ (1 << size))
+    return np.array([int(m) ^ (1 << size) for m in mod], dtype=np.uint64)
+
+def mulmod(a, b, size, low):
+    '''
+    Elementwise a*b in GF(2^size), a carry-less shift and xor product reduced as it goes
+
+    @param low - The irreducible polynomial(s) without the x^size term (see _low)
+    '''
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+    a = a.copy()
+    b = b.copy()
+    result = np.zeros(a.shape, dtype=np.uint64)
+    top = np.uint64(size - 1)
+    mask = np.uint64((1 << size) - 1)
+    for i in range(size):
+        # result ^= a where the low bit of b is set
+        result ^= a & (_ZERO - (b & _ONE))
+        b >>= _ONE
+        if not b.any():
+            break
+        # a *= x, reducing when the x^size term is set
+        carry = (a >> top) & _ONE
+        a = ((a << _ONE) & mask) ^ (low & (_ZERO - carry))
+    return result
+
+def powmod(a, e, size, low):
+    '''
+    Elementwise a**e in GF(2^size) by square and multiply (e may be an int or an array)
+    '''
+    a, e = np.broadcast_arrays(np.asarray(a, dtype=np.uint64), np.asarray(e, dtype=np.uint64))
+    base = a.copy()
+    e = e.copy()
+    result = np.ones(a.shape, dtype=np.uint64)
+    while e.any():
+        bit = (e & _ONE).astype(bool)
+        if bit.any():
+            result = np.where(bit, mulmod(result, base, size, low), result)
+        e >>= _ONE
+        if e.any():
+            base = mulmod(base, base, size, low)
+    return result
+
+def reduce(values, size, mod):
+    '''
+    Reduce arbitrary 64 bit values (e.g. carry-less products of small elements) modulo mod
+    '''
+    values = np.array(values, dtype=np.uint64)
+    if size >= 64:
+        return values
+    mod = np.asarray(mod, dtype=np.uint64)
+    for bit in range(63, size - 1, -1):
+        hit = ((values >> np.uint64(bit)) & _ONE).astype(bool)
+        if hit.any():
+            values ^= np.where(hit, mod << np.uint64(bit - size), _ZERO)
+    return values
+
+class GF2Array:
+    '''
+    A vector of GF(2^size) elements (size <= 64) stored in a NumPy uint64 array
+
+    mod is the irreducible polynomial (including its x^size term). It may be a single int or have one entry
+    per element, so a row of values under different keys can be worked on together.
+    '''
+    def __init__(self, values, size, mod):
+        if not 0 < size <= 64:
+            raise ValueError('GF2Array supports fields of at most 2^64 elements')
+        self.size = size
+        self.mod = mod
+        self.low = _low(size, mod)
+        self.values = np.atleast_1d(_values(values))
+
+    def __repr__(self):
+        return 'GF2Array(%s, size=%d)' % ([hex(i) for i in self.tolist()], self.size)
+
+    def _new(self, values):
+        res = GF2Array.__new__(GF2Array)
+        res.size = self.size
+        res.mod = self.mod
+        res.low = self.low
+        res.values = values
+        return res
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            mod = self.mod if isinstance(self.mod, (int, np.integer)) else self.mod[index]
+            return GF2Array(self.values[index], self.size, mod)
+        return int(self.values[index])
+
+    def tolist(self):
+        return [int(i) for i in self.values]
+
+    @classmethod
+    def full(cls, value, length, size, mod):
+        return cls(np.full(length, int(value), dtype=np.uint64), size, mod)
+
+    def __add__(self, other):
+        return self._new(self.values ^ _values(other))
+
+    __radd__ = __add__
+    __sub__ = __add__
+    __rsub__ = __add__
+
+    def __neg__(self):
+        return self
+
+    def __mul__(self, other):
+        return self._new(mulmod(self.values, _values(other), self.size, self.low))
+
+    __rmul__ = __mul__
+
+    def __pow__(self, e):
+        if isinstance(e, (int, np.integer)) and e < 0:
+            return self.inverse() ** -e
+        return self._new(powmod(self.values, _values(e), self.size, self.low))
+
+    def inverse(self):
+        if not self.values.all():
+            raise ZeroDivisionError('0 has no inverse')
+        return self ** (2**self.size - 2)
+
+    __invert__ = inverse
+
+    def __truediv__(self, other):
+        if not isinstance(other, GF2Array):
+            other = GF2Array(other, self.size, self.mod)
+        return self * other.inverse()
+
+    def __rtruediv__(self, other):
+        return self.inverse() * other
+
+    def equal(self, other):
+        '''
+        Elementwise equality as a boolean array
+        '''
+        return self.values == _values(other)
+
+    def sum(self):
+        return int(np.bitwise_xor.reduce(self.values)) if len(self.values) else 0
+
+def evaluate(coefficients, xs, size, mod):
+    '''
+    Evaluate the polynomial with the given coefficients (lowest degree first) at every x in xs by Horner's method
+
+    @return - A GF2Array of the values
+    '''
+    xs = GF2Array(xs, size, mod)
+    values = GF2Array.full(int(coefficients[-1]), len(xs), size, mod)
+    for c in coefficients[-2::-1]:
+        values = values * xs + int(c)
+    return values
@@ -0,0 +1,217 @@
+import math
+
+from gf2 import GF2
+
+def _isPrime(n):
+    '''
+    Deterministic Miller-Rabin for n < 3.3 * 10**24 (probabilistic, but overwhelmingly reliable, above that)
+    '''
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for r in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _pollardRho(n):
+    '''
+    Find a non trivial factor of the composite n (Brent's variant)
+    '''
+    if n % 2 == 0:
+        return 2
+    c = 1
+    while True:
+        y, r, q, g = 2, 1, 1, 1
+        f = lambda x: (x * x + c) % n
+        while g == 1:
+            x = y
+            for i in range(r):
+                y = f(y)
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for i in range(min(128, r - k)):
+                    y = f(y)
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = f(ys)
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+def factor(n):
+    '''
+    Factor n
+
+    @return - A dictionary from each prime factor of n to its multiplicity
+    '''
+    factors = {}
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if _isPrime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollardRho(m)
+            stack += [d, m // d]
+    return dict(sorted(factors.items()))
+
+# The prime factorization of 2**n - 1 (the order of the unit group of GF(2^n)) as ((p, e), ...)
+# Regenerate with: python groupOrder.py [maxSize] (sizes past the table are factored on demand, which is slow for some n)
+factorTable = {
+    1: (),
+    2: ((3, 1),),
+    3: ((7, 1),),
+    4: ((3, 1), (5, 1)),
+    5: ((31, 1),),
+    6: ((3, 2), (7, 1)),
+    7: ((127, 1),),
+    8: ((3, 1), (5, 1), (17, 1)),
+    9: ((7, 1), (73, 1)),
+    10: ((3, 1), (11, 1), (31, 1)),
+    11: ((23, 1), (89, 1)),
+    12: ((3, 2), (5, 1), (7, 1), (13, 1)),
+    13: ((8191, 1),),
+    14: ((3, 1), (43, 1), (127, 1)),
+    15: ((7, 1), (31, 1), (151, 1)),
+    16: ((3, 1), (5, 1), (17, 1), (257, 1)),
+    17: ((131071, 1),),
+    18: ((3, 3), (7, 1), (19, 1), (73, 1)),
+    19: ((524287, 1),),
+    20: ((3, 1), (5, 2), (11, 1), (31, 1), (41, 1)),
+    21: ((7, 2), (127, 1), (337, 1)),
+    22: ((3, 1), (23, 1), (89, 1), (683, 1)),
+    23: ((47, 1), (178481, 1)),
+    24: ((3, 2), (5, 1), (7, 1), (13, 1), (17, 1), (241, 1)),
+    25: ((31, 1), (601, 1), (1801, 1)),
+    26: ((3, 1), (2731, 1), (8191, 1)),
+    27: ((7, 1), (73, 1), (262657, 1)),
+    28: ((3, 1), (5, 1), (29, 1), (43, 1), (113, 1), (127, 1)),
+    29: ((233, 1), (1103, 1), (2089, 1)),
+    30: ((3, 2), (7, 1), (11, 1), (31, 1), (151, 1), (331, 1)),
+    31: ((2147483647, 1),),
+    32: ((3, 1), (5, 1), (17, 1), (257, 1), (65537, 1)),
+    33: ((7, 1), (23, 1), (89, 1), (599479, 1)),
+    34: ((3, 1), (43691, 1), (131071, 1)),
+    35: ((31, 1), (71, 1), (127, 1), (122921, 1)),
+    36: ((3, 3), (5, 1), (7, 1), (13, 1), (19, 1), (37, 1), (73, 1), (109, 1)),
+    37: ((223, 1), (616318177, 1)),
+    38: ((3, 1), (174763, 1), (524287, 1)),
+    39: ((7, 1), (79, 1), (8191, 1), (121369, 1)),
+    40: ((3, 1), (5, 2), (11, 1), (17, 1), (31, 1), (41, 1), (61681, 1)),
+    41: ((13367, 1), (164511353, 1)),
+    42: ((3, 2), (7, 2), (43, 1), (127, 1), (337, 1), (5419, 1)),
+    43: ((431, 1), (9719, 1), (2099863, 1)),
+    44: ((3, 1), (5, 1), (23, 1), (89, 1), (397, 1), (683, 1), (2113, 1)),
+    45: ((7, 1), (31, 1), (73, 1), (151, 1), (631, 1), (23311, 1)),
+    46: ((3, 1), (47, 1), (178481, 1), (2796203, 1)),
+    47: ((2351, 1), (4513, 1), (13264529, 1)),
+    48: ((3, 2), (5, 1), (7, 1), (13, 1), (17, 1), (97, 1), (241, 1), (257, 1), (673, 1)),
+    49: ((127, 1), (4432676798593, 1)),
+    50: ((3, 1), (11, 1), (31, 1), (251, 1), (601, 1), (1801, 1), (4051, 1)),
+    51: ((7, 1), (103, 1), (2143, 1), (11119, 1), (131071, 1)),
+    52: ((3, 1), (5, 1), (53, 1), (157, 1), (1613, 1), (2731, 1), (8191, 1)),
+    53: ((6361, 1), (69431, 1), (20394401, 1)),
+    54: ((3, 4), (7, 1), (19, 1), (73, 1), (87211, 1), (262657, 1)),
+    55: ((23, 1), (31, 1), (89, 1), (881, 1), (3191, 1), (201961, 1)),
+    56: ((3, 1), (5, 1), (17, 1), (29, 1), (43, 1), (113, 1), (127, 1), (15790321, 1)),
+    57: ((7, 1), (32377, 1), (524287, 1), (1212847, 1)),
+    58: ((3, 1), (59, 1), (233, 1), (1103, 1), (2089, 1), (3033169, 1)),
+    59: ((179951, 1), (3203431780337, 1)),
+    60: ((3, 2), (5, 2), (7, 1), (11, 1), (13, 1), (31, 1), (41, 1), (61, 1), (151, 1), (331, 1), (1321, 1)),
+    61: ((2305843009213693951, 1),),
+    62: ((3, 1), (715827883, 1), (2147483647, 1)),
+    63: ((7, 2), (73, 1), (127, 1), (337, 1), (92737, 1), (649657, 1)),
+    64: ((3, 1), (5, 1), (17, 1), (257, 1), (641, 1), (65537, 1), (6700417, 1)),
+}
+
+def factorGroupOrder(size):
+    '''
+    The prime factorization of 2**size - 1, from factorTable or computed (and added to the table) if size is not in it
+    '''
+    try:
+        return factorTable[size]
+    except KeyError:
+        factors = factorTable[size] = tuple(factor(2**size - 1).items())
+        return factors
+
+def _cofactors(size):
+    # (2**size - 1) // p for each prime p dividing the group order
+    order = 2**size - 1
+    return [order // p for p, e in factorGroupOrder(size)]
+
+def isGenerator(g, size, mod):
+    '''
+    Is g a generator of the multiplicative group of GF(2^size) mod mod
+
+    This takes a single exponentiation per prime factor of 2**size - 1
+    '''
+    g = GF2(value=int(g), size=size, mod=mod)
+    if int(g) == 0:
+        return False
+    return all(int(g**c) != 1 for c in _cofactors(size))
+
+def findGenerator(size, mod, random):
+    '''
+    Find a random generator of the multiplicative group of GF(2^size) mod mod
+
+    @param random - The randomness to use (requires randrange method)
+    '''
+    while True:
+        g = GF2(value=random.randrange(1, 2**size), size=size, mod=mod)
+        if isGenerator(g, size, mod):
+            return g
+
+def randomUnit(size, random):
+    '''
+    A uniformly random s in [1, 2**size - 1) coprime to 2**size - 1, built by the Chinese remainder theorem
+    from a random unit modulo each prime power of the group order so no candidates are rejected
+
+    If g generates the group then so does g**s
+
+    @param random - The randomness to use (requires randrange method)
+    '''
+    order = 2**size - 1
+    if order == 1:
+        return 1
+    s = 0
+    for p, e in factorGroupOrder(size):
+        q = p**e
+
+        # The k-th integer in [1, q) that is not a multiple of p
+        k = random.randrange(q - q // p)
+        r = k + k // (p - 1) + 1
+
+        m = order // q
+        s = (s + r * m * pow(m, -1, q)) % order
+    return s
+
+if __name__ == '__main__':
+    # Print the factorization of 2**n - 1 for each n up to maxSize in the form used by factorTable
+    # python groupOrder.py [maxSize]
+    import sys
+
+    maxSize = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    for size in range(1, maxSize + 1):
+        factors = factor(2**size - 1)
+        assert math.prod(p**e for p, e in factors.items()) == 2**size - 1
+        print('    %d: %r,' % (size, tuple(factors.items())))
@@ -0,0 +1,150 @@
+import sys
+from collections import OrderedDict
+
+class InternCache:
+    '''
+    A size bounded least recently used cache for sharing immutable objects
+
+    A cache with a maxsize of 0 is disabled and always builds a new object
+    '''
+    def __init__(self, maxsize = 0):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key, factory):
+        '''
+        Get the object stored under key, calling factory to build it if it is not cached
+
+        @param key - A hashable key identifying the object
+        @param factory - A function with no arguments that builds the object
+        '''
+        if self.maxsize <= 0:
+            return factory()
+
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return self._store(key, factory())
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def lookup(self, key, default = None):
+        '''
+        Get the object stored under key, or default if it is not cached (nothing is built)
+        '''
+        if self.maxsize <= 0:
+            return default
+
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        '''
+        Cache value under key (if the cache is enabled)
+        '''
+        if self.maxsize > 0:
+            self._store(key, value)
+        return value
+
+    def intern(self, key, value):
+        '''
+        Get the canonical object for key, storing value if there is none
+        '''
+        return self.get(key, lambda: value)
+
+    def _store(self, key, value):
+        self.entries[key] = value
+        while len(self.entries) > self.maxsize:
+            self._evict()
+        return value
+
+    def _evict(self):
+        # Drop the least recently used entry
+        self.entries.popitem(last=False)
+        self.evictions += 1
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.entries) > max(self.maxsize, 0):
+            self._evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def memory(self):
+        '''
+        Approximate number of bytes held by the cached objects (and the cache itself)
+        '''
+        total = sys.getsizeof(self.entries)
+        seen = set()
+        for value in self.entries.values():
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+            for attr in getattr(value, '__dict__', {}).values():
+                total += sys.getsizeof(attr)
+        return total
+
+    def stats(self):
+        return {'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRate': self.hitRate(),
+                'memory': self.memory()}
+
+# Interned constant polynomials (see polynomial.constantPolynomial and polynomial.linearFactor)
+polynomialCache = InternCache()
+
+# Interned field elements that are used as constants (e.g. the x value of each party's share)
+fieldCache = InternCache()
+
+def coefficientKey(c):
+    '''
+    A key for a coefficient that does not confuse equal values from different fields
+    '''
+    return (type(c), c, getattr(c, 'mod', None), getattr(c, 'size', None))
+
+def enableInterning(maxsize = 4096):
+    '''
+    Turn on interning of polynomials and field constants, keeping at most maxsize of each
+    '''
+    polynomialCache.resize(maxsize)
+    fieldCache.resize(maxsize)
+
+def disableInterning():
+    polynomialCache.resize(0)
+    fieldCache.resize(0)
+
+def internStats():
+    return {'polynomial': polynomialCache.stats(), 'field': fieldCache.stats()}
@@ -87,7 +87,7 @@ GF2* polyMultiply(GF2* p, GF2* q, size_t lenP, size_t lenQ,
 
 	int i, k;
 	for(k = lenP + lenQ - 2; k >= 0; --k) {
-		if(k-(lenP-1) > 0) {
+		if(k > (int)lenP-1) {
 			p[k] = gf2mulmod(p[lenP-1], q[k-(lenP-1)], mod);
 			i = lenP-2;
 		}
@@ -542,7 +542,7 @@ Poly* _polyAdd(Poly* p, Poly* q, GFdata* gf) {
 	for(i = lenMin; i < lenMax; ++i) {
 		p->poly[i] = longer->poly[i];
 	}
-	p->degree = lenMax;
+	p->degree = polyDegree(p->poly, lenMax-1);
 	return p;
 }
 
@@ -563,7 +563,7 @@ Poly* _polySub(Poly* p, Poly* q, GFdata* gf) {
 	for(i = lenMin; i < lenMax; ++i) {
 		p->poly[i] = longer->poly[i];
 	}
-	p->degree = lenMax;
+	p->degree = polyDegree(p->poly, lenMax-1);
 	return p;
 }
 
@@ -608,7 +608,7 @@ Poly* _polyMultiply(Poly* p, Poly* q, GFdata* gf) {
 
 	int i, k;
 	for(k = p->degree + q->degree; k >= 0; --k) {
-		if(k-(p->degree) > 0) {
+		if(k > (int)p->degree) {
 			p->poly[k] = gf2mulmod(p->poly[p->degree], q->poly[k-(p->degree)], gf->mod);
 			i = p->degree - 1;
 		}
@@ -718,6 +718,569 @@ Poly* interpolateGF2Poly(GF2* xs, GF2* ys, size_t len, GF2 mod, bool* err) {
 	
 }
 
+Poly* _polyDivRem(Poly* n, Poly* d, Poly* q, Poly* r, GFdata* gf, bool* err) {
+	// Q, R such that N = Q*D + R, N and D are polynomials
+	// Assumptions: d != 0
+	//              q has room for n->degree+1 coefficients, r for n->degree+1
+
+	size_t i, k;
+	GF2 c = d->poly[d->degree];
+	GF2 s;
+
+	_polyCopy(n, r);
+	for(i = 0; i <= n->degree; ++i) {
+		q->poly[i] = 0;
+	}
+	q->degree = 0;
+
+	if(n->degree < d->degree) {
+		return q;
+	}
+
+	for(k = n->degree + 1; k-- > d->degree; ) {
+		if(r->poly[k] == 0) continue;
+
+		// s = lc(r) / lc(d) x^(k - degD)
+		s = gf2divmod(r->poly[k], c, gf->mod, err);
+		q->poly[k - d->degree] = s;
+
+		// r = r - s*d
+		for(i = 0; i <= d->degree; ++i) {
+			r->poly[k - d->degree + i] = gf2sub(r->poly[k - d->degree + i], gf2mulmod(s, d->poly[i], gf->mod), gf->lgsize);
+		}
+	}
+	q->degree = polyDegree(q->poly, n->degree - d->degree);
+	r->degree = d->degree == 0 ? 0 : polyDegree(r->poly, d->degree - 1);
+	return q;
+}
+
+GF2 _polyEvaluate(Poly* p, GF2 x, GFdata* gf) {
+	// Horner's method
+	size_t i = p->degree;
+	GF2 val = p->poly[i];
+	while(i-- > 0) {
+		val = gf2add(gf2mulmod(val, x, gf->mod), p->poly[i], gf->lgsize);
+	}
+	return val;
+}
+
+//-------------------------------------------------------------
+// PolyGF2: a Python polynomial type with GF(2^n) coefficients backed by Poly
+
+typedef struct {
+	PyObject_HEAD
+	Poly p;
+	GFdata gf;
+	Py_ssize_t shape[1];
+} PolyGF2Object;
+
+static PyTypeObject PolyGF2Type;
+
+#define PolyGF2_Check(op) PyObject_TypeCheck(op, &PolyGF2Type)
+
+static int toGF2(PyObject* obj, GF2* out) {
+	// Casts an int (or anything with __int__, e.g. a GF2 element) into a GF2
+	PyObject* pyLong = PyNumber_Long(obj);
+	if(pyLong == NULL) {
+		return -1;
+	}
+	*out = PyLong_AsUnsignedLongLongMask(pyLong);
+	Py_DECREF(pyLong);
+	if(PyErr_Occurred()) {
+		return -1;
+	}
+	return 0;
+}
+
+static PolyGF2Object* PolyGF2_alloc(size_t len, GF2 mod) {
+	// A zero polynomial with room for len coefficients
+	PolyGF2Object* self = (PolyGF2Object*) PolyGF2Type.tp_alloc(&PolyGF2Type, 0);
+	if(self == NULL) {
+		return NULL;
+	}
+	if(len == 0) {
+		len = 1;
+	}
+	if((self->p.poly = (GF2*) calloc(len, sizeof(GF2))) == NULL) {
+		Py_DECREF(self);
+		return (PolyGF2Object*) PyErr_NoMemory();
+	}
+	self->p.len = len;
+	self->p.start = 0;
+	self->p.degree = 0;
+	self->gf.mod = mod;
+	self->gf.lgsize = gf2bitlength(mod) - 1;
+	return self;
+}
+
+static PolyGF2Object* PolyGF2_fromArray(GF2* poly, size_t len, GF2 mod) {
+	// Wraps (and takes ownership of) an array of len coefficients
+	PolyGF2Object* self = (PolyGF2Object*) PolyGF2Type.tp_alloc(&PolyGF2Type, 0);
+	if(self == NULL) {
+		free(poly);
+		return NULL;
+	}
+	self->p.poly = poly;
+	self->p.len = len;
+	self->p.start = 0;
+	self->p.degree = len == 0 ? 0 : polyDegree(poly, len - 1);
+	self->gf.mod = mod;
+	self->gf.lgsize = gf2bitlength(mod) - 1;
+	return self;
+}
+
+static PolyGF2Object* PolyGF2_fromIterable(PyObject* coefficients, GF2 mod) {
+	PyObject* seq = PySequence_Fast(coefficients, "coefficients must be iterable");
+	if(seq == NULL) {
+		return NULL;
+	}
+	size_t len = (size_t) PySequence_Fast_GET_SIZE(seq);
+	PolyGF2Object* self = PolyGF2_alloc(len, mod);
+	if(self == NULL) {
+		Py_DECREF(seq);
+		return NULL;
+	}
+	size_t i;
+	for(i = 0; i < len; ++i) {
+		if(toGF2(PySequence_Fast_GET_ITEM(seq, i), &self->p.poly[i]) < 0) {
+			Py_DECREF(seq);
+			Py_DECREF(self);
+			return NULL;
+		}
+	}
+	Py_DECREF(seq);
+	self->p.degree = len == 0 ? 0 : polyDegree(self->p.poly, len - 1);
+	return self;
+}
+
+static PolyGF2Object* PolyGF2_cast(PyObject* obj, GF2 mod) {
+	// Returns a new reference to obj as a PolyGF2 (constants and polynomial.Polynomial objects are converted)
+	if(PolyGF2_Check(obj)) {
+		Py_INCREF(obj);
+		return (PolyGF2Object*) obj;
+	}
+
+	PyObject* coefficients = PyObject_GetAttrString(obj, "coefficients");
+	if(coefficients != NULL) {
+		PolyGF2Object* res = PolyGF2_fromIterable(coefficients, mod);
+		Py_DECREF(coefficients);
+		return res;
+	}
+	PyErr_Clear();
+
+	GF2 c;
+	if(toGF2(obj, &c) < 0) {
+		return NULL;
+	}
+	PolyGF2Object* res = PolyGF2_alloc(1, mod);
+	if(res != NULL) {
+		res->p.poly[0] = c;
+	}
+	return res;
+}
+
+static void PolyGF2_dealloc(PolyGF2Object* self) {
+	free(self->p.poly);
+	Py_TYPE(self)->tp_free((PyObject*) self);
+}
+
+static PyObject* PolyGF2_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+	static char* kwlist[] = {"coefficients", "mod", NULL};
+	PyObject* coefficients;
+	GF2 mod;
+
+	if(!PyArg_ParseTupleAndKeywords(args, kwds, "OK", kwlist, &coefficients, &mod)) {
+		return NULL;
+	}
+	return (PyObject*) PolyGF2_fromIterable(coefficients, mod);
+}
+
+static PyObject* PolyGF2_repr(PolyGF2Object* self) {
+	PyObject* coefficients = PyList_New((Py_ssize_t) self->p.degree + 1);
+	if(coefficients == NULL) {
+		return NULL;
+	}
+	size_t i;
+	for(i = 0; i <= self->p.degree; ++i) {
+		PyList_SET_ITEM(coefficients, i, PyLong_FromUnsignedLongLong(self->p.poly[i]));
+	}
+	PyObject* mod = PyLong_FromUnsignedLongLong(self->gf.mod);
+	PyObject* hexMod = mod == NULL ? NULL : PyNumber_ToBase(mod, 16);
+	PyObject* res = hexMod == NULL ? NULL : PyUnicode_FromFormat("PolyGF2(%R, mod=%U)", coefficients, hexMod);
+	Py_XDECREF(hexMod);
+	Py_XDECREF(mod);
+	Py_DECREF(coefficients);
+	return res;
+}
+
+static PyObject* PolyGF2_getCoefficients(PolyGF2Object* self, void* closure) {
+	PyObject* res = PyTuple_New((Py_ssize_t) self->p.degree + 1);
+	if(res == NULL) {
+		return NULL;
+	}
+	size_t i;
+	for(i = 0; i <= self->p.degree; ++i) {
+		PyTuple_SET_ITEM(res, i, PyLong_FromUnsignedLongLong(self->p.poly[i]));
+	}
+	return res;
+}
+
+static PyObject* PolyGF2_getMod(PolyGF2Object* self, void* closure) {
+	return PyLong_FromUnsignedLongLong(self->gf.mod);
+}
+
+static PyObject* PolyGF2_degree(PolyGF2Object* self, PyObject* unused) {
+	return PyLong_FromSize_t(self->p.degree);
+}
+
+static PyObject* PolyGF2_call(PolyGF2Object* self, PyObject* args, PyObject* kwds) {
+	PyObject* pyX;
+	GF2 x;
+
+	if(!PyArg_ParseTuple(args, "O", &pyX) || toGF2(pyX, &x) < 0) {
+		return NULL;
+	}
+	return PyLong_FromUnsignedLongLong(_polyEvaluate(&self->p, x, &self->gf));
+}
+
+static PyObject* PolyGF2_evaluateMany(PolyGF2Object* self, PyObject* xs) {
+	PyObject* seq = PySequence_Fast(xs, "xs must be iterable");
+	if(seq == NULL) {
+		return NULL;
+	}
+	Py_ssize_t i, len = PySequence_Fast_GET_SIZE(seq);
+	PyObject* res = PyList_New(len);
+	GF2 x;
+	for(i = 0; res != NULL && i < len; ++i) {
+		if(toGF2(PySequence_Fast_GET_ITEM(seq, i), &x) < 0) {
+			Py_CLEAR(res);
+			break;
+		}
+		PyList_SET_ITEM(res, i, PyLong_FromUnsignedLongLong(_polyEvaluate(&self->p, x, &self->gf)));
+	}
+	Py_DECREF(seq);
+	return res;
+}
+
+static Py_ssize_t PolyGF2_length(PolyGF2Object* self) {
+	return (Py_ssize_t) self->p.degree + 1;
+}
+
+static PyObject* PolyGF2_item(PolyGF2Object* self, Py_ssize_t i) {
+	if(i < 0 || (size_t) i > self->p.degree) {
+		PyErr_SetString(PyExc_IndexError, "coefficient index out of range");
+		return NULL;
+	}
+	return PyLong_FromUnsignedLongLong(self->p.poly[i]);
+}
+
+static Py_hash_t PolyGF2_hash(PolyGF2Object* self) {
+	Py_uhash_t h = (Py_uhash_t) self->gf.mod * 1000003UL;
+	size_t i;
+	for(i = 0; i <= self->p.degree; ++i) {
+		h = (h ^ (Py_uhash_t) self->p.poly[i]) * 1000003UL;
+	}
+	if(h == (Py_uhash_t) -1) {
+		h = (Py_uhash_t) -2;
+	}
+	return (Py_hash_t) h;
+}
+
+static PyObject* PolyGF2_richcompare(PyObject* a, PyObject* b, int op) {
+	if((op != Py_EQ && op != Py_NE) || !PolyGF2_Check(a) || !PolyGF2_Check(b)) {
+		Py_RETURN_NOTIMPLEMENTED;
+	}
+	PolyGF2Object* p = (PolyGF2Object*) a;
+	PolyGF2Object* q = (PolyGF2Object*) b;
+	bool equal = p->gf.mod == q->gf.mod && p->p.degree == q->p.degree;
+	size_t i;
+	for(i = 0; equal && i <= p->p.degree; ++i) {
+		equal = p->p.poly[i] == q->p.poly[i];
+	}
+	if(equal == (op == Py_EQ)) Py_RETURN_TRUE;
+	Py_RETURN_FALSE;
+}
+
+static int PolyGF2_operands(PyObject* a, PyObject* b, PolyGF2Object** p, PolyGF2Object** q) {
+	// Casts both operands of a binary operation to PolyGF2 objects of the same field
+	GF2 mod = PolyGF2_Check(a) ? ((PolyGF2Object*) a)->gf.mod : ((PolyGF2Object*) b)->gf.mod;
+	if((*p = PolyGF2_cast(a, mod)) == NULL) {
+		return -1;
+	}
+	if((*q = PolyGF2_cast(b, mod)) == NULL) {
+		Py_DECREF(*p);
+		return -1;
+	}
+	if((*p)->gf.mod != (*q)->gf.mod) {
+		PyErr_SetString(PyExc_ValueError, "polynomials are over different fields");
+		Py_DECREF(*p);
+		Py_DECREF(*q);
+		return -1;
+	}
+	return 0;
+}
+
+static PyObject* PolyGF2_add(PyObject* a, PyObject* b) {
+	PolyGF2Object *p, *q;
+	if(PolyGF2_operands(a, b, &p, &q) < 0) {
+		PyErr_Clear();
+		Py_RETURN_NOTIMPLEMENTED;
+	}
+	size_t len = (p->p.degree > q->p.degree ? p->p.degree : q->p.degree) + 1;
+	PolyGF2Object* res = PolyGF2_alloc(len, p->gf.mod);
+	if(res != NULL) {
+		_polyCopy(&p->p, &res->p);
+		_polyAdd(&res->p, &q->p, &res->gf);
+	}
+	Py_DECREF(p);
+	Py_DECREF(q);
+	return (PyObject*) res;
+}
+
+static PyObject* PolyGF2_sub(PyObject* a, PyObject* b) {
+	PolyGF2Object *p, *q;
+	if(PolyGF2_operands(a, b, &p, &q) < 0) {
+		PyErr_Clear();
+		Py_RETURN_NOTIMPLEMENTED;
+	}
+	size_t len = (p->p.degree > q->p.degree ? p->p.degree : q->p.degree) + 1;
+	PolyGF2Object* res = PolyGF2_alloc(len, p->gf.mod);
+	if(res != NULL) {
+		_polyCopy(&p->p, &res->p);
+		_polySub(&res->p, &q->p, &res->gf);
+	}
+	Py_DECREF(p);
+	Py_DECREF(q);
+	return (PyObject*) res;
+}
+
+static PyObject* PolyGF2_mul(PyObject* a, PyObject* b) {
+	PolyGF2Object *p, *q;
+	if(PolyGF2_operands(a, b, &p, &q) < 0) {
+		PyErr_Clear();
+		Py_RETURN_NOTIMPLEMENTED;
+	}
+	PolyGF2Object* res = PolyGF2_alloc(p->p.degree + q->p.degree + 1, p->gf.mod);
+	if(res != NULL) {
+		_polyCopy(&p->p, &res->p);
+		_polyMultiply(&res->p, &q->p, &res->gf);
+		res->p.degree = polyDegree(res->p.poly, res->p.degree);
+	}
+	Py_DECREF(p);
+	Py_DECREF(q);
+	return (PyObject*) res;
+}
+
+static PyObject* PolyGF2_divmod(PyObject* a, PyObject* b) {
+	PolyGF2Object *p, *q;
+	if(PolyGF2_operands(a, b, &p, &q) < 0) {
+		PyErr_Clear();
+		Py_RETURN_NOTIMPLEMENTED;
+	}
+	if(q->p.degree == 0 && q->p.poly[0] == 0) {
+		Py_DECREF(p);
+		Py_DECREF(q);
+		PyErr_SetString(PyExc_ZeroDivisionError, "polynomial division by zero");
+		return NULL;
+	}
+	PolyGF2Object* quotient = PolyGF2_alloc(p->p.degree + 1, p->gf.mod);
+	PolyGF2Object* remainder = PolyGF2_alloc(p->p.degree + 1, p->gf.mod);
+	PyObject* res = NULL;
+	bool err = false;
+	if(quotient != NULL && remainder != NULL) {
+		_polyDivRem(&p->p, &q->p, &quotient->p, &remainder->p, &p->gf, &err);
+		if(err) {
+			PyErr_SetString(PyExc_ValueError, "Division Error");
+		}
+		else {
+			res = PyTuple_Pack(2, (PyObject*) quotient, (PyObject*) remainder);
+		}
+	}
+	Py_XDECREF(quotient);
+	Py_XDECREF(remainder);
+	Py_DECREF(p);
+	Py_DECREF(q);
+	return res;
+}
+
+static PyObject* PolyGF2_divmodItem(PyObject* a, PyObject* b, Py_ssize_t i) {
+	PyObject* qr = PolyGF2_divmod(a, b);
+	if(qr == NULL || qr == Py_NotImplemented) {
+		return qr;
+	}
+	PyObject* res = PyTuple_GET_ITEM(qr, i);
+	Py_INCREF(res);
+	Py_DECREF(qr);
+	return res;
+}
+
+static PyObject* PolyGF2_truediv(PyObject* a, PyObject* b) {
+	return PolyGF2_divmodItem(a, b, 0);
+}
+
+static PyObject* PolyGF2_remainder(PyObject* a, PyObject* b) {
+	return PolyGF2_divmodItem(a, b, 1);
+}
+
+static PyObject* PolyGF2_negative(PyObject* self) {
+	// -P = P in characteristic 2
+	Py_INCREF(self);
+	return self;
+}
+
+static int PolyGF2_bool(PolyGF2Object* self) {
+	return self->p.degree > 0 || self->p.poly[0] != 0;
+}
+
+static PyObject* PolyGF2_egcd(PolyGF2Object* self, PyObject* args) {
+	// Same as polynomial.Polynomial.egcd: lists r, s, t with r[i] = self*s[i] + b*t[i]
+	PyObject* b;
+	Py_ssize_t stop = 0;
+	if(!PyArg_ParseTuple(args, "O|n", &b, &stop)) {
+		return NULL;
+	}
+
+	PyObject* r = PyList_New(0);
+	PyObject* s = PyList_New(0);
+	PyObject* t = PyList_New(0);
+	PolyGF2Object* zero = PolyGF2_alloc(1, self->gf.mod);
+	PolyGF2Object* one = PolyGF2_alloc(1, self->gf.mod);
+	PolyGF2Object* bPoly = PolyGF2_cast(b, self->gf.mod);
+	PyObject* res = NULL;
+	PyObject *q = NULL, *tmp = NULL, *next = NULL;
+	PyObject* rows[3];
+	Py_ssize_t i, k;
+
+	if(r == NULL || s == NULL || t == NULL || zero == NULL || one == NULL || bPoly == NULL) {
+		goto done;
+	}
+	one->p.poly[0] = 1;
+
+	if(PyList_Append(r, (PyObject*) self) < 0 || PyList_Append(r, (PyObject*) bPoly) < 0 ||
+	   PyList_Append(s, (PyObject*) one) < 0 || PyList_Append(s, (PyObject*) zero) < 0 ||
+	   PyList_Append(t, (PyObject*) zero) < 0 || PyList_Append(t, (PyObject*) one) < 0) {
+		goto done;
+	}
+
+	rows[0] = r; rows[1] = s; rows[2] = t;
+	while(((PolyGF2Object*) PyList_GET_ITEM(r, PyList_GET_SIZE(r) - 1))->p.degree > (size_t) stop) {
+		k = PyList_GET_SIZE(r);
+
+		// q = r[-2] / r[-1]
+		if((q = PolyGF2_truediv(PyList_GET_ITEM(r, k - 2), PyList_GET_ITEM(r, k - 1))) == NULL) {
+			goto done;
+		}
+
+		// row.append(row[-2] - q*row[-1])
+		for(i = 0; i < 3; ++i) {
+			if((tmp = PolyGF2_mul(q, PyList_GET_ITEM(rows[i], k - 1))) == NULL) {
+				goto done;
+			}
+			if((next = PolyGF2_sub(PyList_GET_ITEM(rows[i], k - 2), tmp)) == NULL) {
+				goto done;
+			}
+			Py_CLEAR(tmp);
+			if(PyList_Append(rows[i], next) < 0) {
+				goto done;
+			}
+			Py_CLEAR(next);
+		}
+		Py_CLEAR(q);
+	}
+	res = PyTuple_Pack(3, r, s, t);
+
+done:
+	Py_XDECREF(q);
+	Py_XDECREF(tmp);
+	Py_XDECREF(next);
+	Py_XDECREF(r);
+	Py_XDECREF(s);
+	Py_XDECREF(t);
+	Py_XDECREF(zero);
+	Py_XDECREF(one);
+	Py_XDECREF(bPoly);
+	return res;
+}
+
+static int PolyGF2_getbuffer(PolyGF2Object* self, Py_buffer* view, int flags) {
+	// The coefficients (lowest degree first) as a read only buffer of unsigned 64 bit ints
+	if(flags & PyBUF_WRITABLE) {
+		PyErr_SetString(PyExc_BufferError, "PolyGF2 is read only");
+		view->obj = NULL;
+		return -1;
+	}
+	self->shape[0] = (Py_ssize_t) self->p.degree + 1;
+
+	view->obj = (PyObject*) self;
+	Py_INCREF(self);
+	view->buf = self->p.poly;
+	view->len = self->shape[0] * sizeof(GF2);
+	view->readonly = 1;
+	view->itemsize = sizeof(GF2);
+	view->format = (flags & PyBUF_FORMAT) ? "Q" : NULL;
+	view->ndim = 1;
+	view->shape = (flags & PyBUF_ND) ? self->shape : NULL;
+	view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? &view->itemsize : NULL;
+	view->suboffsets = NULL;
+	view->internal = NULL;
+	return 0;
+}
+
+static PyBufferProcs PolyGF2_asBuffer = {
+	(getbufferproc) PolyGF2_getbuffer,
+	NULL
+};
+
+static PyNumberMethods PolyGF2_asNumber = {
+	.nb_add = PolyGF2_add,
+	.nb_subtract = PolyGF2_sub,
+	.nb_multiply = PolyGF2_mul,
+	.nb_remainder = PolyGF2_remainder,
+	.nb_divmod = PolyGF2_divmod,
+	.nb_negative = PolyGF2_negative,
+	.nb_bool = (inquiry) PolyGF2_bool,
+	.nb_floor_divide = PolyGF2_truediv,
+	.nb_true_divide = PolyGF2_truediv,
+};
+
+static PySequenceMethods PolyGF2_asSequence = {
+	.sq_length = (lenfunc) PolyGF2_length,
+	.sq_item = (ssizeargfunc) PolyGF2_item,
+};
+
+static PyMethodDef PolyGF2_methods[] = {
+	{"degree", (PyCFunction) PolyGF2_degree, METH_NOARGS, "The degree of the polynomial."},
+	{"evaluateMany", (PyCFunction) PolyGF2_evaluateMany, METH_O, "Evaluates the polynomial at each x in a sequence."},
+	{"egcd", (PyCFunction) PolyGF2_egcd, METH_VARARGS, "Extended Euclidean algorithm, stopping when the remainder has degree <= stop."},
+	{NULL, NULL, 0, NULL}
+};
+
+static PyGetSetDef PolyGF2_getset[] = {
+	{"coefficients", (getter) PolyGF2_getCoefficients, NULL, "The coefficients, lowest degree first.", NULL},
+	{"mod", (getter) PolyGF2_getMod, NULL, "The irreducible polynomial of the field.", NULL},
+	{NULL, NULL, NULL, NULL, NULL}
+};
+
+static PyTypeObject PolyGF2Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_name = "interpolateGF2.PolyGF2",
+	.tp_doc = "A polynomial with coefficients in GF(2^n).",
+	.tp_basicsize = sizeof(PolyGF2Object),
+	.tp_itemsize = 0,
+	.tp_flags = Py_TPFLAGS_DEFAULT,
+	.tp_new = PolyGF2_new,
+	.tp_dealloc = (destructor) PolyGF2_dealloc,
+	.tp_repr = (reprfunc) PolyGF2_repr,
+	.tp_hash = (hashfunc) PolyGF2_hash,
+	.tp_call = (ternaryfunc) PolyGF2_call,
+	.tp_richcompare = PolyGF2_richcompare,
+	.tp_as_number = &PolyGF2_asNumber,
+	.tp_as_sequence = &PolyGF2_asSequence,
+	.tp_as_buffer = &PolyGF2_asBuffer,
+	.tp_methods = PolyGF2_methods,
+	.tp_getset = PolyGF2_getset,
+};
+
 static PyObject* interpolatePolynomial( PyObject *self, PyObject *args ) {
 	GF2 mod;
 	size_t len;
@@ -822,9 +1385,92 @@ static PyObject* decodeReedSolomon( PyObject *self, PyObject *args ) {
 	return resList;
 }
 
+static int parsePoints(PyObject* pList, GF2** xs, GF2** ys, size_t* len) {
+	// Splits a list of (x, y) tuples into arrays of xs and ys
+	size_t i;
+	*len = (size_t) PyList_Size(pList);
+	*xs = (GF2*) malloc((*len ? *len : 1) * sizeof(GF2));
+	*ys = (GF2*) malloc((*len ? *len : 1) * sizeof(GF2));
+	if(*xs == NULL || *ys == NULL) {
+		free(*xs);
+		free(*ys);
+		PyErr_NoMemory();
+		return -1;
+	}
+	for (i = 0; i < *len; ++i) {
+		PyObject* pTuple = PyList_GetItem(pList, i);
+		if(!PyTuple_Check(pTuple) || PyTuple_GET_SIZE(pTuple) != 2) {
+			PyErr_SetString(PyExc_TypeError, "List must contain (x, y) tuples");
+		}
+		else if(toGF2(PyTuple_GET_ITEM(pTuple, 0), &(*xs)[i]) == 0) {
+			toGF2(PyTuple_GET_ITEM(pTuple, 1), &(*ys)[i]);
+		}
+		if(PyErr_Occurred()) {
+			free(*xs);
+			free(*ys);
+			return -1;
+		}
+	}
+	return 0;
+}
+
+static PyObject* interpolate( PyObject *self, PyObject *args ) {
+	GF2 mod;
+	size_t len;
+	PyObject* pList;
+	GF2 *xs, *ys;
+
+	if (!PyArg_ParseTuple(args, "O!K", &PyList_Type, &pList, &mod)) {
+		return NULL;
+	}
+	if(parsePoints(pList, &xs, &ys, &len) < 0) {
+		return NULL;
+	}
+
+	bool err = false;
+	GF2* res = interpolateGF2(xs, ys, len, mod, &err);
+	free(xs);
+	free(ys);
+
+	if(err) {
+		PyErr_SetString(PyExc_ValueError, "Interpolation Error");
+		free(res);
+		return NULL;
+	}
+	return (PyObject*) PolyGF2_fromArray(res, len, mod);
+}
+
+static PyObject* decode( PyObject *self, PyObject *args ) {
+	GF2 mod;
+	size_t len, k;
+	PyObject* pList;
+	GF2 *xs, *ys;
+
+	if (!PyArg_ParseTuple(args, "O!nK", &PyList_Type, &pList, &k, &mod)) {
+		return NULL;
+	}
+	if(parsePoints(pList, &xs, &ys, &len) < 0) {
+		return NULL;
+	}
+
+	bool err = false;
+	GF2* res = decodeReedSolomonGF2(xs, ys, len, k, mod, &err);
+	free(xs);
+	free(ys);
+
+	if(err) {
+		PyErr_SetString(PyExc_ValueError, "Interpolation Error");
+		free(res);
+		return NULL;
+	}
+	return (PyObject*) PolyGF2_fromArray(res, len, mod);
+}
+
 static PyMethodDef interpolateGF2_funcs[] = {
 	{"interpolatePolynomial", interpolatePolynomial, METH_VARARGS, "Interpolates a polynomial."},
 	{"decodeReedSolomon", decodeReedSolomon, METH_VARARGS, "Decodes and corrects a Reed Solomon encoding."},
+	{"interpolate", interpolate, METH_VARARGS, "Interpolates a polynomial, returning a PolyGF2."},
+	{"decode", decode, METH_VARARGS, "Decodes and corrects a Reed Solomon encoding, returning a PolyGF2."},
 	{NULL, NULL, 0, NULL}
 };
 
@@ -840,7 +1486,22 @@ PyMODINIT_FUNC PyInit_interpolateGF2(void)
 {
 	Py_Initialize();
 
-	return PyModule_Create(&interpolateGF2_definition);
+	if(PyType_Ready(&PolyGF2Type) < 0) {
+		return NULL;
+	}
+
+	PyObject* module = PyModule_Create(&interpolateGF2_definition);
+	if(module == NULL) {
+		return NULL;
+	}
+
+	Py_INCREF(&PolyGF2Type);
+	if(PyModule_AddObject(module, "PolyGF2", (PyObject*) &PolyGF2Type) < 0) {
+		Py_DECREF(&PolyGF2Type);
+		Py_DECREF(module);
+		return NULL;
+	}
+	return module;
 }
 
 
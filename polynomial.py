@@ -2,6 +2,13 @@ from functools import reduce
 from collections import defaultdict
 import math
 
+from interning import polynomialCache, coefficientKey
+
+try:
+    from gf2array import evaluate as evaluateArray
+except ImportError:
+    evaluateArray = None
+
 class InverseException(Exception):
     pass   
 
@@ -18,6 +25,19 @@ class PolynomialMeta(type):
             
         return ret   
 
+def constantPolynomial(c, mod = None):
+    '''
+    The polynomial c, shared when interning is enabled
+    '''
+    return polynomialCache.get(('constant', coefficientKey(c), mod), lambda: Polynomial(coefficients=[c], mod=mod))
+
+def linearFactor(x, mod = None):
+    '''
+    The polynomial (x - x_i), shared when interning is enabled
+    '''
+    return polynomialCache.get(('linear', coefficientKey(x), mod), lambda: Polynomial(coefficients=[-x, 1], mod=mod))
+
+# Interning every construction churns the cache with temporaries, so only the constants below are interned
 #class Polynomial(metaclass=PolynomialMeta):
 class Polynomial:
     def __init__(self, *, degree = 0, coefficients = None, mod = None):
@@ -180,7 +200,7 @@ class Polynomial:
     def __divmod__(self, other):
         if other.degree() == 0:
             return self / other[0], self-self
-        q = Polynomial(coefficients=[0], mod=self.mod)
+        q = constantPolynomial(0, mod=self.mod)
         #r = Polynomial(coefficients=self.coefficients[:], mod=self.mod)
         r = self
         d = other.degree()
@@ -197,18 +217,28 @@ class Polynomial:
             rightmost -= 1
         return rightmost
     
-    def extract(self, *args):
-        data = b''
-        for i in range(*args):
-            output = self(i)
-            data += output.to_bytes(t.bit_length()//8+1, 'big')
-        return data
+    def extract(self, *args, width = None, out = None):
+        '''
+        Evaluate the polynomial at each x in range(*args) as width byte big endian ints
+        
+        @param width - Bytes per value (defaults to the size of the GF2 coefficients)
+        @param out - A bytearray or writable memoryview to write into instead of returning new bytes
+        '''
+        xs = range(*args)
+        if width is None:
+            width = extractWidth(self)
+        if out is None:
+            out = bytearray(len(xs) * width)
+            extractInto(self, xs, width, out)
+            return bytes(out)
+        extractInto(self, xs, width, out)
+        return out
     
     def egcd(self, b, stop = 0):
         mod = self.mod
         r = [self, b]
-        s = [Polynomial(coefficients=[1], mod=mod), Polynomial(coefficients=[0], mod=mod)]
-        t = [Polynomial(coefficients=[0], mod=mod), Polynomial(coefficients=[1], mod=mod)]
+        s = [constantPolynomial(1, mod=mod), constantPolynomial(0, mod=mod)]
+        t = [constantPolynomial(0, mod=mod), constantPolynomial(1, mod=mod)]
         while r[-1].degree() > stop:
             q = r[-2] / r[-1]
             r.append(r[-2] - q*r[-1])
@@ -217,23 +247,136 @@ class Polynomial:
             assert r[-1] == self*s[-1] + b*t[-1]
         return r, s, t    
 
+def evaluateMany(poly, xs):
+    '''
+    Evaluate poly at every x in xs, running Horner's method over all of them at once
+    '''
+    # Native polynomials (interpolateGF2.PolyGF2) evaluate in C
+    if hasattr(poly, 'evaluateMany'):
+        return poly.evaluateMany(xs)
+    
+    xs = list(xs)
+    coefficients = poly.coefficients
+    
+    # Rows of GF2 points are evaluated with NumPy when it is available
+    field = [c for c in coefficients if hasattr(c, 'size') and hasattr(c, 'mod')]
+    if evaluateArray is not None and poly.mod is None and field and field[0].size <= 64:
+        return evaluateArray(coefficients, xs, field[0].size, field[0].mod).tolist()
+    
+    values = [coefficients[-1]] * len(xs)
+    for c in coefficients[-2::-1]:
+        values = [c + x*v for x, v in zip(xs, values)]
+        if poly.mod is not None:
+            values = [v % poly.mod for v in values]
+    return values
+
+def extractWidth(poly):
+    '''
+    The number of bytes needed for a value of poly (from the size of its GF2 coefficients)
+    '''
+    size = getattr(poly.coefficients[0], 'size', None)
+    if size is None:
+        raise ValueError('width is required for polynomials without GF2 coefficients')
+    return math.ceil(size/8)
+
+def extractInto(poly, xs, width, out, offset = 0):
+    '''
+    Write poly(x) for each x in xs into out as width byte big endian ints
+    
+    @param out - A bytearray or writable memoryview with room for len(xs) * width bytes after offset
+    
+    @return - The offset after the last value written
+    '''
+    view = memoryview(out).cast('B')
+    for value in evaluateMany(poly, xs):
+        view[offset:offset+width] = int(value).to_bytes(width, 'big')
+        offset += width
+    return offset
+
+def extractChunks(poly, xs, width, chunkSize = 4096):
+    '''
+    Yield poly(x) for each x in xs as bytes, chunkSize values at a time
+    '''
+    xs = list(xs)
+    for start in range(0, len(xs), chunkSize):
+        chunk = xs[start:start+chunkSize]
+        out = bytearray(len(chunk) * width)
+        extractInto(poly, chunk, width, out)
+        yield bytes(out)
+
 def lagrangeBasisPolynomial(j, points, mod = None):
-    numerator = Polynomial(degree=0, mod=mod)
+    numerator = constantPolynomial(1, mod=mod)
     denominator = 1
     xj, yj = points[j]
     for i, p in enumerate(points):
         if i != j:
             xi, yi = p
-            numerator *= Polynomial(coefficients=[-xi, 1])
+            numerator *= linearFactor(xi)
             denominator *= xj - xi
             #assert int((numerator/denominator)(xj)) == 1
             #assert int((numerator/denominator)(xi)) == 0
             #print([int(i) for i in (numerator/ denominator)])
     return [numerator, denominator]
 
+def lagrangeBasis(xs, mod = None):
+    '''
+    Compute the Lagrange basis polynomials for the x values xs
+    
+    The basis only depends on the x values so it can be shared by every point set that uses them
+    '''
+    points = [(x, None) for x in xs]
+    basis = []
+    for j in range(len(points)):
+        numerator, denominator = lagrangeBasisPolynomial(j, points, mod=mod)
+        basis.append(numerator / denominator)
+    return basis
+
+def interpolateBasis(basis, ys, mod = None):
+    '''
+    Interpolate the points (x_j, ys[j]) given the Lagrange basis of the x values
+    '''
+    res = constantPolynomial(0, mod=mod)
+    for l, y in zip(basis, ys):
+        res += l * y
+    return res
+
+def parityCheckMatrix(xs, degree):
+    '''
+    Compute the parity check matrix of the Reed-Solomon code of polynomials of at most degree evaluated at xs
+    
+    Row r is v_j * xs[j]**r (for r < len(xs) - degree - 1) where v_j is the inverse of the product of xs[j] - xs[k]
+    for every k != j. Like the Lagrange basis it only depends on the x values so it can be shared
+    '''
+    one = xs[0]**0
+    row = []
+    for j, xj in enumerate(xs):
+        denominator = one
+        for k, xk in enumerate(xs):
+            if k != j:
+                denominator *= xj - xk
+        row.append(one / denominator)
+    
+    matrix = []
+    for r in range(len(xs) - degree - 1):
+        matrix.append(row)
+        row = [v * x for v, x in zip(row, xs)]
+    return matrix
+
+def syndrome(matrix, ys):
+    '''
+    The syndrome of ys, which is all zeros exactly when ys are the evaluations of a polynomial in the code of matrix
+    '''
+    res = []
+    for row in matrix:
+        s = 0
+        for h, y in zip(row, ys):
+            s = h * y + s
+        res.append(s)
+    return res
+
 # TODO: Cache lagrange Basis Polynomials since they are reused when the same x values are used
 def interpolatePolynomial(points, mod = None):
-    res = Polynomial(coefficients=[0], mod=mod)
+    res = constantPolynomial(0, mod=mod)
     numDens = []
     for j, p in enumerate(points):
         xj, yj = p
@@ -282,12 +425,15 @@ def interpolatePolynomial(points, mod = None):
 def decodeReedSolomon(points, k, mod = None, makePoly = None):
     if makePoly is None:
         makePoly = lambda l: Polynomial(coefficients=l, mod=mod)
+        factor = lambda x: linearFactor(x, mod=mod)
+    else:
+        factor = lambda x: makePoly([-x, 1])
     n = len(points)
     points = [i for i in points if i[1] is not None]
     d = n - len(points)
-    g0 = Polynomial()
+    g0 = constantPolynomial(1)
     for p in points:
-        g0 *= makePoly([-p[0], 1])    
+        g0 *= factor(p[0])    
     g1, remainder = interpolatePolynomial(points, mod=mod)
     
     g, u, v = g0.egcd(g1, (n+k-d-1)//2)
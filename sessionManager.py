@@ -0,0 +1,414 @@
+import time
+import math
+from collections import deque, defaultdict, OrderedDict
+
+from gf2 import GF2
+from polynomial import lagrangeBasis
+
+from coinFlipping import fieldConstant, encryptCells, decryptCells, nativeInterpolation
+from shareMatrix import storage
+
+class BackpressureError(Exception):
+    pass
+
+def percentile(values, p):
+    '''
+    Nearest rank percentile of values
+
+    @param values - A sorted list of numbers
+    @param p - The percentile to find (0-100)
+    '''
+    if not values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+class Session:
+    '''
+    A share or reconstruct request made by a single CoinFlipping object
+    '''
+    def __init__(self, sessionId, coinFlipping, kind, args):
+        self.sessionId = sessionId
+        self.coinFlipping = coinFlipping
+        self.kind = kind
+        self.args = args
+
+        # Cell tasks waiting to be scheduled
+        self.pending = deque()
+
+        # Number of scheduled tasks that have not finished
+        self.outstanding = 0
+
+        self.phase = None
+        self.results = None
+        self.result = None
+
+        # The exception that failed the session (its result is then None)
+        self.error = None
+
+        self.submitted = time.perf_counter()
+        self.finished = None
+
+    def latency(self):
+        if self.finished is None:
+            return None
+        return self.finished - self.submitted
+
+class SessionManager:
+    '''
+    Run many independent CoinFlipping sessions together, batching the field work of all of them
+
+    Encryptions and decryptions of the same field size are run together as one row (see encryptCells and
+    decryptCells). Without the native interpolation, decodes under the same modulus share their Lagrange bases.
+
+    A batch that raises is rerun a session at a time, so only the sessions whose own tasks raise fail.
+    '''
+    def __init__(self, *, maxSessions = 64, batchSize = 1024, quantum = None, block = True, basisCacheSize = 16, latencyWindow = 1024):
+
+        # The most sessions that may be in flight at once
+        self.maxSessions = maxSessions
+
+        # The most tasks to run in a single batch
+        self.batchSize = batchSize
+
+        # The most tasks a single session may contribute to a batch
+        self.quantum = quantum
+        if self.quantum is None:
+            self.quantum = max(1, self.batchSize // self.maxSessions)
+
+        # Should submit run batches until there is room (or raise BackpressureError)
+        self.block = block
+
+        # Lagrange bases keyed by (xs, polyMod)
+        self.basisCacheSize = basisCacheSize
+        self.basisCache = OrderedDict()
+
+        self.nextId = 0
+        self.active = deque()
+
+        # Finished sessions until their results are collected (by run or result)
+        self.completed = {}
+
+        # The latencies of the most recently finished sessions
+        self.latencies = deque(maxlen = latencyWindow)
+
+        self.started = None
+        self.flips = 0
+        self.finished = 0
+        self.failed = 0
+        self.batches = 0
+        self.tasks = 0
+
+    def submit(self, coinFlipping, kind, *args):
+        '''
+        Queue work for a session
+
+        @param coinFlipping - The CoinFlipping object doing the work
+        @param kind - Either 'share' (args are sharedPublicKeys, polyMod) or 'reconstruct' (args are encShares, sharedPublicKeys, sharedSecretKeys, polyMod)
+
+        @return - The id of the session
+        '''
+        if kind not in ('share', 'reconstruct'):
+            raise ValueError('Unknown session kind %r' % (kind,))
+
+        # The session is timed from here so its latency includes any time spent waiting for room
+        session = Session(self.nextId, coinFlipping, kind, args)
+        self.nextId += 1
+
+        if self.started is None:
+            self.started = session.submitted
+
+        while len(self.active) >= self.maxSessions:
+            if not self.block:
+                raise BackpressureError('%d sessions already in flight' % len(self.active))
+            self.step()
+
+
+        if kind == 'share':
+            self._startShare(session)
+        else:
+            self._startReconstruct(session)
+
+        self.active.append(session)
+        return session.sessionId
+
+    def submitShare(self, coinFlipping, sharedPublicKeys, polyMod = None):
+        return self.submit(coinFlipping, 'share', sharedPublicKeys, polyMod)
+
+    def submitReconstruct(self, coinFlipping, encShares, sharedPublicKeys, sharedSecretKeys, polyMod):
+        return self.submit(coinFlipping, 'reconstruct', encShares, sharedPublicKeys, sharedSecretKeys, polyMod)
+
+    def _startShare(self, session):
+        sharedPublicKeys, polyMod = session.args
+        cf = session.coinFlipping
+        deal = cf.dealShares(polyMod)
+
+        session.phase = 'encrypt'
+        session.results = [None] * cf.n
+        for i, publicKey in enumerate(sharedPublicKeys):
+            session.pending.append((('encrypt', cf.size), (i, publicKey, int(deal[i]))))
+
+    def _startReconstruct(self, session):
+        encShares, sharedPublicKeys, sharedSecretKeys, polyMod = session.args
+        cf = session.coinFlipping
+
+        # Warnings from an earlier attempt are found again if they still apply
+        cf.userWarnings = [None] * cf.n
+
+        session.phase = 'decrypt'
+        session.results = [[None] * cf.n for i in range(cf.n)]
+
+        # Transpose the encrypted shares array so that each row can be decrypted by a single user
+        encShares = list(zip(*encShares))
+        for shareIndex, (publicKeyRow, secretKeyRow, encSharesRow) in enumerate(zip(sharedPublicKeys, sharedSecretKeys, encShares)):
+            if publicKeyRow is None or secretKeyRow is None or encSharesRow is None:
+                cf.userWarnings[shareIndex] = 'Aborted'
+                continue
+            for i, (publicKey, secretKey, encShare) in enumerate(zip(publicKeyRow, secretKeyRow, encSharesRow)):
+                session.pending.append((('decrypt', cf.size), (shareIndex, i, publicKey, secretKey, encShare)))
+
+    def _startDecode(self, session):
+        polyMod = session.args[-1]
+        cf = session.coinFlipping
+
+        # Transpose the shares so each row corrosponds to a polynomial and remove null values
+        pointList = [[x for x in points if x is not None] for points in zip(*session.results)]
+
+        # The columns are decoded together so complete ones can be screened by the parity check (see decodeColumns)
+        session.phase = 'decode'
+        session.results = None
+        session.pending.append((('decode', polyMod, cf.size), pointList))
+
+    def _advance(self, session):
+        cf = session.coinFlipping
+        if session.phase == 'encrypt':
+            cf.encDeal = session.results
+            self._finish(session, cf.encDeal)
+        elif session.phase == 'decrypt':
+            self._startDecode(session)
+        elif session.phase == 'decode':
+            polynomials, screened = session.results
+            self._finish(session, cf.combine(polynomials, session.args[-1], screened = screened))
+            self.flips += 1
+
+    def _finish(self, session, result):
+        session.result = result
+        session.phase = 'done'
+        session.finished = time.perf_counter()
+        self.completed[session.sessionId] = session
+        self.latencies.append(session.latency())
+        self.finished += 1
+
+    def _fail(self, session, error):
+        session.error = error
+        session.pending.clear()
+        session.phase = 'failed'
+        session.finished = time.perf_counter()
+        self.completed[session.sessionId] = session
+        self.failed += 1
+
+    def _schedule(self):
+        '''
+        Take tasks round robin from the active sessions, at most quantum from each, until the batch is full
+        '''
+        batch = []
+        taken = 0
+        for turn in range(len(self.active)):
+            session = self.active[0]
+            self.active.rotate(-1)
+
+            count = 0
+            while session.pending and count < self.quantum and taken < self.batchSize:
+                batch.append((session, session.pending.popleft()))
+                count += 1
+                taken += 1
+            session.outstanding += count
+
+            if taken >= self.batchSize:
+                break
+        return batch
+
+    def step(self):
+        '''
+        Run a single batch of tasks
+
+        @return - The number of tasks run
+        '''
+        batch = self._schedule()
+
+        groups = defaultdict(list)
+        for session, (group, task) in batch:
+            groups[group].append((session, task))
+
+        try:
+            for group, tasks in groups.items():
+                try:
+                    self._runGroup(group, tasks)
+                except Exception:
+                    self._isolate(group, tasks)
+        finally:
+            for session, task in batch:
+                session.outstanding -= 1
+
+        # Move sessions on to their next phase (sessions may finish with no tasks, e.g. if everyone aborted)
+        for session in list(self.active):
+            if session.phase != 'failed' and not session.pending and session.outstanding == 0:
+                try:
+                    self._advance(session)
+                except Exception as e:
+                    self._fail(session, e)
+            if session.phase in ('done', 'failed'):
+                self.active.remove(session)
+
+        self.batches += 1
+        self.tasks += len(batch)
+        return len(batch)
+
+    def _runGroup(self, group, tasks):
+        if group[0] == 'encrypt':
+            self._runEncrypt(group, tasks)
+        elif group[0] == 'decrypt':
+            self._runDecrypt(group, tasks)
+        else:
+            self._runDecode(group, tasks)
+
+    def _isolate(self, group, tasks):
+        '''
+        Rerun a group that raised a session at a time, failing only the sessions whose tasks raise again
+        '''
+        bySession = OrderedDict()
+        for session, task in tasks:
+            bySession.setdefault(session, []).append((session, task))
+
+        for session, sessionTasks in bySession.items():
+            if session.phase == 'failed':
+                continue
+            try:
+                self._runGroup(group, sessionTasks)
+            except Exception as e:
+                self._fail(session, e)
+
+    def _runEncrypt(self, group, tasks):
+        # Every task in the group has the same field size so they are encrypted as a single row
+        tag, size = group
+        messages = [share for session, (i, publicKey, share) in tasks]
+        publicKeys = [publicKey for session, (i, publicKey, share) in tasks]
+        ciphertexts = encryptCells(messages, publicKeys, size, tasks[0][0].coinFlipping.random)
+        for (session, (i, publicKey, share)), ciphertext in zip(tasks, ciphertexts):
+            session.results[i] = ciphertext
+
+    def _runDecrypt(self, group, tasks):
+        # Every task in the group has the same field size so they are decrypted as a single row
+        tag, size = group
+        present = [encShare is not None for session, (shareIndex, i, publicKey, secretKey, encShare) in tasks]
+        c1 = storage(len(tasks), size)
+        c2 = storage(len(tasks), size)
+        for j, (session, (shareIndex, i, publicKey, secretKey, encShare)) in enumerate(tasks):
+            if encShare is not None:
+                c1[j], c2[j] = map(int, encShare)
+        publicKeys = [publicKey for session, (shareIndex, i, publicKey, secretKey, encShare) in tasks]
+        secretKeys = [secretKey for session, (shareIndex, i, publicKey, secretKey, encShare) in tasks]
+
+        shares, warnings = decryptCells(publicKeys, secretKeys, c1, c2, present, size)
+        for (session, (shareIndex, i, publicKey, secretKey, encShare)), share, warning in zip(tasks, shares, warnings):
+            cf = session.coinFlipping
+            polyMod = session.args[-1]
+            if warning is not None:
+                cf.userWarnings[shareIndex] = warning
+            if share is not None:
+                session.results[shareIndex][i] = (fieldConstant(shareIndex + cf.degree + 1, size, polyMod), GF2(value=share, size=size, mod=polyMod))
+
+    def _basis(self, xs, polyMod, size):
+        if (xs, polyMod) in self.basisCache:
+            self.basisCache.move_to_end((xs, polyMod))
+            return self.basisCache[(xs, polyMod)]
+
+        basis = lagrangeBasis([fieldConstant(x, size, polyMod) for x in xs])
+        self.basisCache[(xs, polyMod)] = basis
+        if len(self.basisCache) > self.basisCacheSize:
+            self.basisCache.popitem(last=False)
+        return basis
+
+    def _runDecode(self, group, tasks):
+        # Every session in the group shares a modulus, so columns with the same x values share a Lagrange basis
+        # (the native interpolation is faster than interpolating from a basis so it is used when available)
+        tag, polyMod, size = group
+        basis = None if nativeInterpolation else (lambda xs: self._basis(xs, polyMod, size))
+        for session, pointList in tasks:
+            cf = session.coinFlipping
+            session.results = cf.decodeColumns(pointList, polyMod, basis = basis)
+
+    def run(self):
+        '''
+        Run batches until every submitted session is done
+
+        The finished sessions are forgotten once their results are returned
+
+        @return - A dictionary from session id to the result of each session that finished since the last run
+                  (and was not collected with result). A session that failed maps to the exception that failed it
+        '''
+        while self.active:
+            self.step()
+        results = {sessionId: session.result if session.error is None else session.error for sessionId, session in self.completed.items()}
+        self.completed.clear()
+        return results
+
+    def result(self, sessionId):
+        '''
+        Get the result of a finished session (and forget about it), raising the exception that failed it if it failed
+        '''
+        session = self.completed.pop(sessionId)
+        if session.error is not None:
+            raise session.error
+        return session.result
+
+    def stats(self):
+        '''
+        Latency percentiles (in seconds) of the latest latencyWindow finished sessions and the aggregate throughput
+        '''
+        latencies = sorted(self.latencies)
+        elapsed = 0 if self.started is None else time.perf_counter() - self.started
+        return {'sessions': self.finished,
+                'failed': self.failed,
+                'inFlight': len(self.active),
+                'batches': self.batches,
+                'tasks': self.tasks,
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p99': percentile(latencies, 99),
+                'flipsPerSecond': self.flips / elapsed if elapsed > 0 else 0.0}
+
+if __name__ == '__main__':
+    import random
+    random.seed(0)
+
+    from coinFlipping import CoinFlipping
+    from gf2 import findRandomIrreduciblePolynomial
+
+    sessions = 16
+    n = 8
+    lgSize = 8
+
+    manager = SessionManager(maxSessions = 8)
+
+    rounds = []
+    for s in range(sessions):
+        parties = [CoinFlipping(n, lgSize, random) for i in range(n)]
+        for party in parties:
+            party.generateKeys(hardcode = True)
+        polyMod = findRandomIrreduciblePolynomial(lgSize, random)
+
+        # party j's i-th key is used by dealer i to encrypt the share for party j
+        for i, party in enumerate(parties):
+            manager.submitShare(party, [parties[j].publicKeys[i] for j in range(n)], polyMod)
+        rounds.append((parties, polyMod))
+    manager.run()
+
+    for parties, polyMod in rounds:
+        encShares = [party.encDeal for party in parties]
+        sharedPublicKeys = [party.publicKeys for party in parties]
+        sharedSecretKeys = [party.privateKeys for party in parties]
+        manager.submitReconstruct(CoinFlipping(n, lgSize, random), encShares, sharedPublicKeys, sharedSecretKeys, polyMod)
+    results = manager.run()
+
+    print(manager.stats())
@@ -0,0 +1,249 @@
+import sys
+from array import array
+
+def storage(length, size = 64):
+    '''
+    A zeroed sequence of length entries that can hold GF(2^size) elements (an array('Q') unless size is over 64)
+    '''
+    if size <= 64:
+        return array('Q', bytes(8 * length))
+    return [0] * length
+
+class ShareMatrix:
+    '''
+    A matrix of field elements (as ints) stored in one contiguous array('Q') with a bitmap of erased entries
+
+    Fields of more than 64 bits fall back to a list of ints. Transposing gives a view of the same storage,
+    nothing is copied
+    '''
+    def __init__(self, rows, cols, *, size = 64, data = None, present = None, transposed = False):
+        self.rows = rows
+        self.cols = cols
+        self.size = size
+        self.transposed = transposed
+
+        # Entries stored row major (in the untransposed orientation)
+        self.data = data
+        if self.data is None:
+            self.data = storage(rows * cols, size)
+
+        # Bit k is set if entry k of data is present
+        self.present = present
+        if self.present is None:
+            self.present = bytearray((rows * cols + 7) // 8)
+
+    def __repr__(self):
+        return 'ShareMatrix(%d, %d)%s' % (self.rows, self.cols, '.T' if self.transposed else '')
+
+    def _index(self, i, j):
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError('(%d, %d) is out of range' % (i, j))
+        if self.transposed:
+            return j * self.rows + i
+        return i * self.cols + j
+
+    @property
+    def T(self):
+        return ShareMatrix(self.cols, self.rows, size = self.size, data = self.data, present = self.present, transposed = not self.transposed)
+
+    def isPresent(self, i, j):
+        k = self._index(i, j)
+        return bool(self.present[k >> 3] & (1 << (k & 7)))
+
+    def __getitem__(self, index):
+        i, j = index
+        k = self._index(i, j)
+        if not self.present[k >> 3] & (1 << (k & 7)):
+            return None
+        return self.data[k]
+
+    def __setitem__(self, index, value):
+        i, j = index
+        k = self._index(i, j)
+        if value is None:
+            self.data[k] = 0
+            self.present[k >> 3] &= ~(1 << (k & 7)) & 0xff
+        else:
+            self.data[k] = int(value)
+            self.present[k >> 3] |= 1 << (k & 7)
+
+    def row(self, i):
+        return [self[i, j] for j in range(self.cols)]
+
+    def values(self, i):
+        '''
+        The entries of row i in the matrix's own storage type (erased entries are 0, see presence)
+        '''
+        if not 0 <= i < self.rows:
+            raise IndexError('row %d is out of range' % i)
+        if self.transposed:
+            return self.data[i::self.rows]
+        return self.data[i * self.cols:(i + 1) * self.cols]
+
+    def presence(self, i):
+        '''
+        A list of whether each entry of row i is present
+        '''
+        return [self.isPresent(i, j) for j in range(self.cols)]
+
+    def count(self, i):
+        '''
+        The number of entries of row i that are present
+        '''
+        return sum(self.isPresent(i, j) for j in range(self.cols))
+
+    def points(self, i, xs, make = None):
+        '''
+        The points (xs[j], entry) for each entry of row i that is present
+
+        @param xs - The x value of each column
+        @param make - A function to cast the entries (e.g. into GF2 elements)
+        '''
+        points = []
+        for j in range(self.cols):
+            k = self._index(i, j)
+            if self.present[k >> 3] & (1 << (k & 7)):
+                points.append((xs[j], self.data[k] if make is None else make(self.data[k])))
+        return points
+
+    def nbytes(self):
+        if isinstance(self.data, array):
+            return self.data.itemsize * len(self.data) + len(self.present)
+        return sum(map(sys.getsizeof, self.data)) + len(self.present)
+
+    @classmethod
+    def fromRows(cls, rows, cols = None, size = 64):
+        '''
+        Build a matrix from a nested list of ints (None for erased entries)
+        '''
+        if cols is None:
+            cols = max((len(row) for row in rows if row is not None), default = 0)
+        matrix = cls(len(rows), cols, size = size)
+        for i, row in enumerate(rows):
+            if row is None:
+                continue
+            for j, value in enumerate(row):
+                matrix[i, j] = value
+        return matrix
+
+    @classmethod
+    def fromCiphertexts(cls, encShares, cols = None, size = 64):
+        '''
+        Split a nested list of ElGamal ciphertexts into a matrix of each half
+
+        @return - (c1, c2) sharing one erasure bitmap
+        '''
+        if cols is None:
+            cols = max((len(row) for row in encShares if row is not None), default = 0)
+        c1 = cls(len(encShares), cols, size = size)
+        c2 = cls(len(encShares), cols, size = size, present = c1.present)
+        for i, row in enumerate(encShares):
+            if row is None:
+                continue
+            for j, ciphertext in enumerate(row):
+                if ciphertext is not None:
+                    c1[i, j], c2[i, j] = ciphertext
+        return c1, c2
+
+if __name__ == '__main__':
+    # Compare the peak memory and time of reconstruct as it was (nested tuples of GF2 objects, one ElGamal key per
+    # share) with CoinFlipping.reconstruct (ShareMatrix storage) on the same inputs, with and without keyCache
+    # python shareMatrix.py [n] [lgSize]
+    import os
+    import sys
+    import time
+    import hashlib
+    import subprocess
+    import tracemalloc
+    import random
+
+    def baselineReconstruct(cf, encShares, sharedPublicKeys, sharedSecretKeys, polyMod):
+        from gf2 import GF2
+        import ElGamal
+
+        encShares = list(zip(*encShares))
+
+        shares = []
+        GF2GenPoly = lambda x: GF2(value=x, size=cf.size, mod=polyMod)
+        for shareIndex, (publicKeyRow, secretKeyRow, encSharesRow) in enumerate(zip(sharedPublicKeys, sharedSecretKeys, encShares)):
+            if publicKeyRow is None or secretKeyRow is None or encSharesRow is None:
+                shares.append([None] * cf.n)
+                continue
+            sharesRow = []
+            for publicKey, secretKey, encShare in zip(publicKeyRow, secretKeyRow, encSharesRow):
+                mod, generator, publicKey = publicKey
+                GF2Gen = lambda x: GF2(value=x, size=cf.size, mod=mod)
+                key = ElGamal.ElGamal(generator=GF2Gen(generator), lgGroupSize=cf.size, random=cf.random, secretKey=GF2Gen(secretKey))
+                if int(key.publicKey) != publicKey:
+                    sharesRow.append(None)
+                    continue
+                share = int(key.decrypt(tuple(map(GF2Gen, encShare))))
+                sharesRow.append((GF2GenPoly(shareIndex + cf.degree + 1), GF2GenPoly(share)))
+            shares.append(sharesRow)
+
+        shares = list(zip(*shares))
+        pointList = [list(filter(lambda x: x is not None, points)) for points in shares]
+
+        # Decoding and combining are the same for both
+        polynomials, screened = cf.decodeColumns(pointList, polyMod)
+        return cf.combine(polynomials, polyMod, screened = screened)
+
+    def inputs(n, lgSize):
+        from coinFlipping import CoinFlipping, hardcodedKeys
+        from gf2 import findRandomIrreduciblePolynomial
+
+        random.seed(0)
+        parties = [CoinFlipping(n, lgSize, random) for i in range(n)]
+        for party in parties:
+            party.generateKeys(hardcode = True)
+        if lgSize in hardcodedKeys:
+            polyMod = hardcodedKeys[lgSize][0][0]
+        else:
+            polyMod = findRandomIrreduciblePolynomial(lgSize, random)
+        encShares = [party.share([parties[j].publicKeys[i] for j in range(n)], polyMod) for i, party in enumerate(parties)]
+        return encShares, [party.publicKeys for party in parties], [party.privateKeys for party in parties], polyMod
+
+    if len(sys.argv) > 3:
+        from coinFlipping import CoinFlipping, keyCache
+        from checkpoint import CheckpointCache
+
+        mode, n, lgSize = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+        encShares, sharedPublicKeys, sharedSecretKeys, polyMod = inputs(n, lgSize)
+        if mode == 'uncached':
+            keyCache.resize(0)
+
+        def run():
+            # Nothing is reused from an earlier run
+            keyCache.clear()
+            cf = CoinFlipping(n, lgSize, random, checkpoints = CheckpointCache(0))
+            if mode == 'baseline':
+                return baselineReconstruct(cf, encShares, sharedPublicKeys, sharedSecretKeys, polyMod)
+            return cf.reconstruct(encShares, sharedPublicKeys, sharedSecretKeys, polyMod)
+
+        # Time one run and trace the allocations of another (tracing slows it down)
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(peak // 1024, elapsed, hashlib.sha256(result).hexdigest())
+    else:
+        n = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+        lgSize = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+        digests = set()
+        for mode in ('baseline', 'current', 'uncached'):
+            # The rusage of each child on its own (RUSAGE_CHILDREN is the largest of every child waited for so far)
+            child = subprocess.Popen([sys.executable, __file__, mode, str(n), str(lgSize)], stdout = subprocess.PIPE)
+            output = child.stdout.read()
+            child.stdout.close()
+            pid, status, usage = os.wait4(child.pid, 0)
+            child.returncode = os.waitstatus_to_exitcode(status)
+            if child.returncode != 0:
+                raise subprocess.CalledProcessError(child.returncode, child.args)
+
+            peak, elapsed, digest = output.decode().split()
+            digests.add(digest)
+            print('%-8s n = %d: peak RSS %d KiB, reconstruct peak %s KiB (tracemalloc) in %.2fs' % (mode, n, usage.ru_maxrss, peak, float(elapsed)))
+        print('outputs match' if len(digests) == 1 else 'OUTPUTS DIFFER')